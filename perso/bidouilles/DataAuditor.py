@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+from perso.utils.null_tokens import NullTokens
+
 class DataAuditor:
     """
     Classe dédiée à l'audit / diagnostic qualité d'un DataFrame pandas.
@@ -17,7 +19,8 @@ class DataAuditor:
     - colonnes constantes ou quasi-constantes
     - détection d'outliers (méthode IQR et Z-score simple)
     - colonnes à très haute cardinalité (souvent des identifiants)
-    - problèmes fréquents dans les colonnes texte (vides, trop longues, etc.)
+    - problèmes fréquents dans les colonnes texte (vides, trop longues, faux vides
+      comme 'N/A', '-', 'inconnu'... selon le dictionnaire NullTokens)
 
     Exemples d'utilisation (commentaires) :
     --------------------------------------
@@ -39,7 +42,7 @@ class DataAuditor:
         print("Attention : plus de 10% de valeurs manquantes → nettoyage recommandé")
     """
 
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, null_tokens: NullTokens = None):
         """
         Initialise l'auditeur avec une copie du DataFrame.
 
@@ -47,6 +50,8 @@ class DataAuditor:
         ----------
         df : pd.DataFrame
             Le DataFrame à auditer (une copie est créée)
+        null_tokens : NullTokens, optionnel
+            Dictionnaire des faux vides (par défaut : français + anglais)
 
         Exemple :
         --------
@@ -54,6 +59,7 @@ class DataAuditor:
         auditor = DataAuditor(df)
         """
         self.df = df.copy()
+        self.null_tokens = null_tokens or NullTokens()
         self.report = {}
         self._run_audit()
 
@@ -153,8 +159,10 @@ class DataAuditor:
         issues = {}
         for col in self.df.select_dtypes(['object', 'string']).columns:
             s = self.df[col].astype(str).str
+            tokens = self.null_tokens.count(self.df[col])
             problems = {
                 'empty_or_whitespace': (s.strip() == '').sum(),
+                'null_tokens': sum(n for cat, n in tokens.items() if cat not in ('NaN', 'Vide')),
                 'very_long_200': (s.len() > 200).sum(),
                 'very_short_nonempty': ((s.len() > 0) & (s.len() <= 2)).sum()
             }
@@ -248,6 +256,7 @@ class DataAuditor:
             print("\nProblèmes texte :")
             for col, iss in r['string_problems'].items():
                 print(f"  • {col:<24} vides: {iss['empty_or_whitespace']:5,} | "
+                    f"faux vides: {iss['null_tokens']:5,} | "
                     f"très longs (>200): {iss['very_long_200']:5,}")
 
         print("\n" + "═" * 90)
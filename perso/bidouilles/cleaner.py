@@ -17,9 +17,489 @@
 #
 # =============================================================================
 
+import re
+import json
+import time
+import pickle
+import inspect
+import hashlib
+import unicodedata
+import zlib
+import warnings
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from functools import lru_cache, partial, wraps
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+from perso.utils.null_tokens import NullTokens
+
+# %%
+@lru_cache(maxsize=32)
+def _compile_replacer(items: tuple):
+    """
+    Compile un dictionnaire de remplacements en UNE seule regex d'alternation.
+
+    Les clés sont triées par longueur décroissante : à une position donnée,
+    la plus longue clé possible gagne (sémantique « leftmost-longest »).
+    Le résultat est mis en cache → un dictionnaire n'est compilé qu'une fois.
+    """
+    mapping = {old: new for old, new in items if old}
+    keys = sorted(mapping, key=len, reverse=True)
+    pattern = re.compile("|".join(re.escape(k) for k in keys))
+    return pattern, mapping
+
+def _to_builtin(value):
+    """ Convertit un scalaire numpy en type Python natif (sérialisable JSON) """
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+def _profiled_step(method):
+    """
+    Décorateur des étapes chaînables : ajoute une entrée structurée à
+    self.steps (nom, paramètres, lignes avant/après, colonnes touchées,
+    durée, delta mémoire du DataFrame) et l'envoie au callback éventuel.
+
+    Si un CheckpointStore est branché, l'étape est d'abord cherchée dans le
+    cache (clé = empreinte de l'entrée + nom + paramètres) et sautée si trouvée.
+    """
+    signature = inspect.signature(method)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        params = {k: v for k, v in bound.arguments.items() if k != 'self'}
+
+        rows_before = len(self.df)
+        mem_before = self.df.memory_usage(index=True, deep=self.profile_deep).sum()
+        start = time.perf_counter()
+
+        key = cached = None
+        store = self.checkpoint_store
+        if store is not None:
+            if self._fingerprint is None:
+                self._fingerprint = store.fingerprint(self.df)
+            key = store.make_key(self._fingerprint, method.__name__, params)
+            cached = store.load(key) if key is not None else None
+
+        self._step_columns = None
+        if cached is not None:
+            self.df = cached
+            result = self
+            self._log_action(f"{method.__name__} → chargé depuis le checkpoint {key[:12]}")
+        else:
+            result = method(self, *args, **kwargs)
+
+        elapsed = time.perf_counter() - start
+        if key is not None and cached is None and elapsed >= self.checkpoint_min_seconds:
+            if not store.save(key, self.df):
+                self._log_action(f"{method.__name__} → checkpoint impossible (données non sérialisables), étape non cachée")
+                key = None
+        if key is not None:
+            self._fingerprint = key
+        elif store is not None:
+            self._fingerprint = None        # étape non cachée : empreinte recalculée sur le résultat
+        # Colonnes résolues par l'étape (_touch) ; sinon (checkpoint) celles demandées
+        columns = self._step_columns
+        if columns is None:
+            columns = params.get('columns')
+        if columns is None and isinstance(params.get('type_dict'), dict):
+            columns = list(params['type_dict'])
+        entry = {
+            'step': method.__name__,
+            'params': params,
+            'rows_before': rows_before,
+            'rows_after': len(self.df),
+            'columns': list(columns) if columns is not None else 'toutes',
+            'wall_time_s': elapsed,
+            'memory_delta_bytes': int(self.df.memory_usage(index=True, deep=self.profile_deep).sum() - mem_before),
+            'from_checkpoint': cached is not None,
+        }
+        self.steps.append(entry)
+        if self.callback is not None:
+            self.callback(entry)
+        return result
+
+    return wrapper
+
+
+# ──── Opérations colonne par colonne (fonctions de module → picklables pour n_jobs > 1) ────
+
+def _clean_string_column(s: pd.Series, lowercase, strip, remove_extra_spaces, replace_na):
+    if replace_na is not None:
+        s = s.fillna(replace_na)
+    if pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s):
+        if lowercase:       s = s.str.lower()
+        if strip:           s = s.str.strip()
+        if remove_extra_spaces:
+            s = s.str.replace(r'\s+', ' ', regex=True)
+    return s
+
+
+def _strip_accents(value):
+    if pd.isna(value): return value
+    return ''.join(c for c in unicodedata.normalize('NFD', str(value))
+                   if unicodedata.category(c) != 'Mn')
+
+
+def _strip_accents_column(s: pd.Series):
+    return s.apply(_strip_accents)
+
+
+def _fill_with_statistic(s: pd.Series, strategy):
+    """ Retourne (colonne imputée, valeur utilisée) ; None si colonne non numérique """
+    if not pd.api.types.is_numeric_dtype(s):
+        return None
+    if strategy == 'mean':
+        val = s.mean()
+    elif strategy == 'median':
+        val = s.median()
+    else:
+        mode = s.mode()
+        val = mode[0] if not mode.empty else np.nan
+    return s.fillna(val), val
+
+
+def _convert_column(s: pd.Series, dtype):
+    """ Retourne (colonne convertie, None) ou (None, exception) """
+    try:
+        if dtype == 'category':
+            return s.astype('category'), None
+        numeric = pd.to_numeric(s, errors='coerce')
+        # int + NaN → équivalent nullable ('int' → 'Int64', 'int32' → 'Int32'...)
+        if numeric.isna().any():
+            try:
+                np_dtype = np.dtype(dtype)
+            except TypeError:
+                np_dtype = None     # type pandas ('Int64', 'boolean'...) : déjà nullable
+            if np_dtype is not None and np_dtype.kind in 'iu':
+                dtype = np_dtype.name.replace('int', 'Int').replace('uInt', 'UInt')
+        return numeric.astype(dtype), None
+    except Exception as e:
+        return None, e
+
+
+_BOOL_TOKENS = {'true': True, 'false': False, 'vrai': True, 'faux': False,
+                'yes': True, 'no': False, 'oui': True, 'non': False}
+
+
+def _smallest_int_dtype(numeric: pd.Series) -> str:
+    """ Plus petit entier (nullable si NaN) capable de contenir min..max """
+    lo, hi = numeric.min(), numeric.max()
+    nullable = numeric.isna().any()
+    for candidate in ['int8', 'int16', 'int32', 'int64']:
+        info = np.iinfo(candidate)
+        if info.min <= lo and hi <= info.max:
+            return candidate.replace('int', 'Int') if nullable else candidate
+    return str(numeric.dtype)           # hors int64 (ex. uint64) : type d'origine, sans perte
+
+
+def _numeric_round_trips(texts: pd.Series, numeric: pd.Series) -> bool:
+    """
+    True si chaque texte est un nombre qui se réécrit à l'identique une fois
+    converti ('06000' → 6000 ou '0612345678' → 612345678 perdent le zéro :
+    la colonne doit rester du texte). Zéros finaux après la virgule tolérés.
+    """
+    if numeric.isna().any():
+        return False
+    canon = texts.str.lstrip('+')
+    has_dot = canon.str.contains('.', regex=False)
+    canon = canon.where(~has_dot, canon.str.rstrip('0').str.rstrip('.'))
+    rewritten = numeric.map(lambda v: str(int(v)) if float(v).is_integer() else repr(float(v)))
+    return bool((canon == rewritten).all())
+
+
+def _infer_tight_column(s: pd.Series, category_ratio, float_rtol):
+    """
+    Retourne (colonne convertie dans le type le plus compact, None).
+    Ordre d'essai : booléen → entier → float32 → datetime → category.
+    """
+    try:
+        non_null = s.dropna()
+        if non_null.empty or pd.api.types.is_bool_dtype(s) or isinstance(s.dtype, pd.CategoricalDtype):
+            return s, None
+
+        if pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s):
+            uniques = pd.Series(non_null.unique()).astype(str).str.strip().str.lower()
+            if uniques.isin(list(_BOOL_TOKENS)).all():
+                return s.astype(str).str.strip().str.lower().map(_BOOL_TOKENS).astype('boolean'), None
+
+            numeric = pd.to_numeric(s, errors='coerce')
+            # Vérification sur les valeurs distinctes seulement
+            pairs = pd.DataFrame({'texte': non_null.astype(str).str.strip(),
+                                  'nombre': numeric[non_null.index]}).drop_duplicates('texte')
+            if _numeric_round_trips(pairs['texte'], pairs['nombre']):
+                s = numeric
+            elif pairs['nombre'].notna().all():
+                return s, None              # codes postaux, téléphones... : texte conservé
+            else:
+                # Test sur un échantillon avant de parser toute la colonne
+                # (sans le UserWarning « Could not infer format » de chaque colonne texte)
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', UserWarning)
+                    if pd.to_datetime(non_null.head(1000), errors='coerce').notna().all():
+                        parsed = pd.to_datetime(s, errors='coerce')
+                        if parsed.notna().sum() == len(non_null):
+                            return parsed, None
+                if non_null.nunique() <= category_ratio * len(non_null):
+                    return s.astype('category'), None
+                return s, None
+
+        if pd.api.types.is_numeric_dtype(s):
+            values = s.to_numpy(dtype='float64', na_value=np.nan)
+            finite = values[~np.isnan(values)]
+            if np.all(np.mod(finite, 1) == 0):
+                return s.astype(_smallest_int_dtype(s)), None
+            as32 = values.astype('float32').astype('float64')
+            if np.allclose(as32, values, rtol=float_rtol, atol=0, equal_nan=True):
+                return s.astype('float32'), None
+        return s, None
+    except Exception as e:
+        return None, e
+
+
+# ──── Dédoublonnage approximatif (MinHash LSH + distance d'édition) ────
+
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+def _normalize_key(value: str) -> str:
+    """ Clé de comparaison : minuscules, sans accents, espaces compactés """
+    return ' '.join(_strip_accents(str(value)).lower().split())
+
+
+def _char_shingles(text: str, ngram: int) -> np.ndarray:
+    """ Hash crc32 des n-grammes de caractères (texte encadré d'espaces) """
+    padded = f" {text} "
+    grams = {padded[i:i + ngram] for i in range(max(len(padded) - ngram + 1, 1))}
+    return np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+def _minhash_signatures(texts: list, ngram: int, num_perm: int, seed=0, batch_size=20_000) -> np.ndarray:
+    """
+    Signatures MinHash (len(texts) × num_perm), calculées par lots :
+    h_k(x) = (a_k × x + b_k) mod p, puis minimum par texte avec np.minimum.reduceat.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _MERSENNE_PRIME, num_perm, dtype=np.uint64)[:, None]
+    b = rng.integers(0, _MERSENNE_PRIME, num_perm, dtype=np.uint64)[:, None]
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint64)
+
+    for start in range(0, len(texts), batch_size):
+        shingles = [_char_shingles(t, ngram) for t in texts[start:start + batch_size]]
+        offsets = np.cumsum([0] + [len(sh) for sh in shingles[:-1]])
+        flat = np.concatenate(shingles) % _MERSENNE_PRIME
+        hashed = (a * flat + b) % _MERSENNE_PRIME
+        signatures[start:start + len(shingles)] = np.minimum.reduceat(hashed, offsets, axis=1).T
+    return signatures
+
+
+def _levenshtein_ratio_py(s1: str, s2: str) -> float:
+    """ Similarité 1 - distance / longueur max (programmation dynamique pure Python) """
+    if s1 == s2:
+        return 1.0
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    previous = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1, 1):
+        current = [i]
+        for j, c2 in enumerate(s2, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (c1 != c2)))
+        previous = current
+    return 1 - previous[-1] / max(len(s1), 1)
+
+
+# Implémentation choisie une fois à l'import (rapidfuzz si installé) : un import
+# raté à chaque paire candidate coûtait plus cher que la comparaison elle-même
+try:
+    from rapidfuzz.distance.Levenshtein import normalized_similarity as _levenshtein_ratio
+except ImportError:
+    _levenshtein_ratio = _levenshtein_ratio_py
+
+
+def _lsh_candidate_pairs(signatures: np.ndarray, bands: int, max_bucket: int, seed=0) -> set:
+    """
+    Paires candidates : deux textes sont candidats s'ils partagent au moins
+    une bande de signature identique → pas de comparaison de toutes les paires.
+    Les buckets de plus de max_bucket éléments sont ignorés (valeurs trop génériques).
+    """
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    weights = np.random.default_rng(seed + 1).integers(1, 2**63, rows, dtype=np.uint64)
+    pairs = set()
+    for band in range(bands):
+        # hash de la bande : produit scalaire modulo 2^64 (débordement volontaire)
+        band_hash = (signatures[:, band * rows:(band + 1) * rows] * weights).sum(axis=1)
+        order = np.argsort(band_hash, kind='stable')
+        sorted_hash = band_hash[order]
+        bounds = np.flatnonzero(np.diff(sorted_hash)) + 1
+        for group in np.split(order, bounds):
+            if 1 < len(group) <= max_bucket:
+                members = group.tolist()
+                for i, x in enumerate(members):
+                    for y in members[i + 1:]:
+                        pairs.add((x, y) if x < y else (y, x))
+    return pairs
+
+
+def _checkpoint_param(value):
+    """ Forme JSON stable des paramètres non natifs (json.dumps default=) """
+    if isinstance(value, NullTokens):
+        return {'NullTokens': value.table}
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if isinstance(value, (np.generic, np.ndarray, pd.Index, pd.Series)):
+        return value.tolist()
+    raise TypeError(f"Paramètre non sérialisable de façon stable : {type(value).__name__}")
+
+
+class CheckpointStore:
+    """
+    Cache disque des DataFrames intermédiaires d'une chaîne DataCleaner.
+
+    - clé = hash(empreinte de l'entrée + nom de l'étape + paramètres) → relancer
+      une chaîne dont le début n'a pas changé recharge ces étapes au lieu de
+      les recalculer
+    - format 'parquet' ou 'feather' (pyarrow requis, index conservé)
+    - éviction LRU (date de dernier accès) au-delà de max_entries fichiers ou
+      de max_bytes octets au total
+
+    Exemple :
+        store = CheckpointStore("cache_nettoyage", max_bytes=2 * 1024**3)
+        DataCleaner(df, checkpoint_store=store, checkpoint_min_seconds=1.0)
+    """
+
+    def __init__(self, directory: str, fmt='parquet', max_entries=None, max_bytes=None):
+        if fmt not in ['parquet', 'feather']:
+            raise ValueError("fmt doit valoir 'parquet' ou 'feather'")
+        self.directory = directory
+        self.fmt = fmt
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def fingerprint(df: pd.DataFrame) -> str:
+        """ Empreinte du contenu (valeurs + index + colonnes + types) """
+        h = hashlib.sha256()
+        h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        h.update(repr(list(df.columns)).encode())
+        h.update(repr(list(df.dtypes.astype(str))).encode())
+        return h.hexdigest()
+
+    @staticmethod
+    def make_key(fingerprint: str, step: str, params: dict):
+        """
+        Clé stable de l'étape, ou None si un paramètre n'a pas de forme
+        sérialisable stable (sa repr contiendrait une adresse mémoire →
+        la clé changerait à chaque exécution) : l'étape n'est pas mise en cache.
+        """
+        try:
+            payload = json.dumps({'input': fingerprint, 'step': step, 'params': params},
+                                 sort_keys=True, default=_checkpoint_param)
+        except TypeError:
+            return None
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.{self.fmt}")
+
+    def load(self, key: str):
+        """ DataFrame en cache, ou None """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        os.utime(path)                  # marque l'accès pour l'éviction LRU
+        if self.fmt == 'parquet':
+            return pd.read_parquet(path)
+        import pyarrow.feather as feather
+        return feather.read_table(path).to_pandas()
+
+    def save(self, key: str, df: pd.DataFrame) -> bool:
+        """
+        Écrit le checkpoint ; False si pyarrow ne sait pas le sérialiser
+        (ex. colonne object mélangeant nombres et textes) — le cache est
+        optionnel, il ne doit pas faire planter la chaîne.
+        """
+        path = self._path(key)
+        tmp = path + ".tmp"
+        try:
+            if self.fmt == 'parquet':
+                df.to_parquet(tmp)
+            else:
+                import pyarrow as pa
+                import pyarrow.feather as feather
+                feather.write_feather(pa.Table.from_pandas(df, preserve_index=True), tmp)
+        except (ValueError, TypeError, NotImplementedError):     # ArrowInvalid, ArrowTypeError...
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return False
+        os.replace(tmp, path)           # écriture atomique : pas de checkpoint à moitié écrit
+        self._evict()
+        return True
+
+    def _evict(self):
+        """ Supprime les checkpoints les moins récemment utilisés """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(f".{self.fmt}"):
+                st = os.stat(os.path.join(self.directory, name))
+                entries.append((st.st_mtime, st.st_size, name))
+        entries.sort()                  # plus ancien accès d'abord
+        total = sum(size for _, size, _ in entries)
+        while entries and ((self.max_entries is not None and len(entries) > self.max_entries)
+                           or (self.max_bytes is not None and total > self.max_bytes)):
+            _, size, name = entries.pop(0)
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(f".{self.fmt}"):
+                os.remove(os.path.join(self.directory, name))
+
+
+def _column_kind(s: pd.Series) -> int:
+    """ 0 = entier, 1 = autre numérique, 2 = texte (les booléens restent du texte) """
+    if pd.api.types.is_bool_dtype(s) or not pd.api.types.is_numeric_dtype(s):
+        return 2
+    return 0 if pd.api.types.is_integer_dtype(s) else 1
+
+
+class _ReservoirSample:
+    """
+    Échantillon uniforme de taille bornée (algorithme R, vectorisé numpy).
+    Sert de « sketch » pour estimer médiane / quartiles sur un flux de chunks
+    sans jamais tout garder en mémoire.
+    """
+
+    def __init__(self, size: int, seed: int = 0):
+        self.size = size
+        self.values = np.empty(size, dtype='float64')
+        self.seen = 0
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, arr: np.ndarray):
+        arr = arr[~np.isnan(arr)]
+        # 1. Remplissage initial de l'échantillon
+        n_fill = min(max(self.size - self.seen, 0), len(arr))
+        self.values[self.seen:self.seen + n_fill] = arr[:n_fill]
+        self.seen += n_fill
+        arr = arr[n_fill:]
+        if len(arr) == 0:
+            return
+        # 2. Le i-ème élément remplace une case au hasard avec proba size / (i + 1)
+        idx = self.seen + np.arange(len(arr))
+        slots = self.rng.integers(0, idx + 1)
+        keep = slots < self.size
+        self.values[slots[keep]] = arr[keep]
+        self.seen += len(arr)
+
+    def to_array(self) -> np.ndarray:
+        return self.values[:min(self.seen, self.size)]
 
 # %%
 class DataCleaner:
@@ -30,10 +510,32 @@ class DataCleaner:
     - Nettoyage spécifique texte + valeurs manquantes + outliers + types
     """
 
-    def __init__(self, df: pd.DataFrame):
-        """ Initialise avec une copie du DataFrame """
-        self.df = df.copy()
+    def __init__(self, df: pd.DataFrame = None, callback=None, profile_deep=False, n_jobs=1,
+                 checkpoint_store: CheckpointStore = None, checkpoint_min_seconds=0.0):
+        """
+        Initialise avec une copie du DataFrame (optionnel si on ne fait que transform)
+
+        - callback     → fonction appelée avec chaque entrée de self.steps
+                         (ex : envoi vers un outil de métriques)
+        - profile_deep → mesure mémoire « deep » (contenu des chaînes inclus, plus lent)
+        - n_jobs       → nb de processus pour les opérations colonne par colonne
+                         (clean_strings, remove_accents, handle_missing mean/median/mode,
+                         convert_types) ; -1 = tous les cœurs. Au-delà de 1, le module
+                         doit être importable (pas de classe définie dans un notebook).
+        - checkpoint_store       → CheckpointStore pour reprendre une chaîne interrompue
+        - checkpoint_min_seconds → seules les étapes plus longues sont sauvegardées
+        """
+        self.df = df.copy() if df is not None else None
         self.log = []               # Historique des actions
+        self.steps = []             # Journal structuré par étape (voir _profiled_step)
+        self.params = {}            # Paramètres appris par fit()
+        self.callback = callback
+        self.profile_deep = profile_deep
+        self.n_jobs = os.cpu_count() if n_jobs == -1 else (n_jobs or 1)
+        self.checkpoint_store = checkpoint_store
+        self.checkpoint_min_seconds = checkpoint_min_seconds
+        self._fingerprint = None    # empreinte de self.df, chaînée d'étape en étape
+        self._step_columns = None   # colonnes réellement traitées par l'étape en cours
 
     def _log_action(self, message: str):
         """ Enregistre une action avec horodatage """
@@ -48,7 +550,37 @@ class DataCleaner:
             return "Aucune opération effectuée."
         return "\n".join(self.log)
 
+    def get_steps_df(self) -> pd.DataFrame:
+        """ Journal structuré des étapes sous forme de DataFrame """
+        return pd.DataFrame(self.steps)
+
+    def export_steps_json(self, path: str = None) -> str:
+        """ Journal structuré en JSON (écrit dans `path` si fourni) """
+        content = json.dumps(self.steps, ensure_ascii=False, indent=2, default=str)
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+        return content
+
+    def _map_columns(self, func, columns, *per_column_args) -> list:
+        """
+        Applique func(colonne, *args_de_la_colonne) à chaque colonne, en parallèle
+        si n_jobs > 1 (les arguments communs se passent via functools.partial).
+        Seules les colonnes concernées sont envoyées aux workers (pas le DataFrame
+        entier) ; les résultats sont réaffectés colonne par colonne par l'appelant.
+        """
+        series = [self.df[col] for col in columns]
+        if self.n_jobs <= 1 or len(series) < 2:
+            return list(map(func, series, *per_column_args))
+        with ProcessPoolExecutor(max_workers=min(self.n_jobs, len(series))) as pool:
+            return list(pool.map(func, series, *per_column_args))
+
+    def _touch(self, columns):
+        """ Enregistre les colonnes traitées par l'étape en cours (journal des étapes) """
+        self._step_columns = list(columns)
+
 # %%
+    @_profiled_step
     def drop_duplicates(self, keep='first'):
         """ Supprime les lignes identiques """
         before = len(self.df)
@@ -58,97 +590,238 @@ class DataCleaner:
         return self
 
 # %%
-    def handle_missing(self, strategy='drop', columns=None, fill_value=None):
+    @_profiled_step
+    def handle_missing(self, strategy='drop', columns=None, fill_value=None, by=None):
         """
         Stratégies : 'drop', 'mean', 'median', 'mode', 'zero', 'custom'
         
         - 'mean'   → moyenne arithmétique
         - 'median' → valeur centrale après tri (robuste aux outliers)
+        - by=['ville', 'categorie'] (mean/median/mode) → statistique calculée
+          par groupe, valeur globale pour les groupes sans aucune valeur
         """
         target_cols = columns if columns else self.df.columns
         before_na = self.df.isna().sum().sum()
 
         if strategy == 'drop':
             self.df = self.df.dropna(subset=target_cols)
+            self._touch(target_cols)
             self._log_action(f"Drop NaN → ~{before_na} valeurs traitées")
 
-        elif strategy in ['mean', 'median', 'mode']:
-            for col in target_cols:
-                if pd.api.types.is_numeric_dtype(self.df[col]):
-                    if strategy == 'mean':
-                        val = self.df[col].mean()
-                    elif strategy == 'median':
-                        val = self.df[col].median()
-                    else:
-                        val = self.df[col].mode()[0] if not self.df[col].mode().empty else np.nan
-                    self.df[col] = self.df[col].fillna(val)
+        elif strategy in ['mean', 'median', 'mode'] and by:
+            by = [by] if isinstance(by, str) else list(by)
+            cols = [c for c in target_cols if c not in by and pd.api.types.is_numeric_dtype(self.df[c])]
+            group_values = self._group_statistic(strategy, cols, by)
+            global_values = self._global_statistic(strategy, cols)
+            self.df[cols] = self.df[cols].fillna(group_values.fillna(global_values))
+            self._touch(cols)
+            self._log_action(f"{cols} → {strategy} par groupe {by} (repli global = {global_values.to_dict()})")
+
+        elif strategy in ['mean', 'median', 'mode'] and self.n_jobs > 1:
+            target_cols = list(target_cols)
+            touched = []
+            for col, res in zip(target_cols, self._map_columns(partial(_fill_with_statistic, strategy=strategy), target_cols)):
+                if res is not None:
+                    self.df[col], val = res
+                    touched.append(col)
                     self._log_action(f"{col} → {strategy} = {val}")
+            self._touch(touched)
+
+        elif strategy in ['mean', 'median', 'mode']:
+            cols = [c for c in target_cols if pd.api.types.is_numeric_dtype(self.df[c])]
+            values = self._global_statistic(strategy, cols)
+            self.df[cols] = self.df[cols].fillna(values)
+            self._touch(cols)
+            for col, val in values.items():
+                self._log_action(f"{col} → {strategy} = {val}")
 
         elif strategy == 'zero':
             self.df[target_cols] = self.df[target_cols].fillna(0)
+            self._touch(target_cols)
             self._log_action(f"Imputation 0 sur {target_cols}")
 
         elif strategy == 'custom' and fill_value is not None:
             self.df[target_cols] = self.df[target_cols].fillna(fill_value)
+            self._touch(target_cols)
             self._log_action(f"Imputation '{fill_value}' sur {target_cols}")
 
         return self
 
+    def _global_statistic(self, strategy, cols) -> pd.Series:
+        """ Une statistique par colonne, en un seul appel vectorisé """
+        if strategy == 'mode':
+            modes = self.df[cols].mode()
+            return modes.iloc[0] if not modes.empty else pd.Series(np.nan, index=cols)
+        return self.df[cols].agg(strategy)
+
+    def _group_statistic(self, strategy, cols, by) -> pd.DataFrame:
+        """
+        Statistique par groupe, alignée sur les lignes de self.df (NaN si le
+        groupe n'a aucune valeur). Un seul groupby pour toutes les colonnes.
+        """
+        if strategy != 'mode':
+            return self.df.groupby(by, dropna=False)[cols].transform(strategy)
+
+        # Mode : comptage (groupe, colonne, valeur) en format long, puis la
+        # valeur la plus fréquente de chaque (groupe, colonne)
+        long = (self.df[by + cols]
+                .melt(id_vars=by, var_name='_col', value_name='_val')
+                .dropna(subset=['_val']))
+        counts = long.groupby(by + ['_col', '_val'], dropna=False).size().rename('_n').reset_index()
+        modes = (counts.sort_values('_n', ascending=False, kind='stable')
+                 .drop_duplicates(subset=by + ['_col'])
+                 .pivot_table(index=by, columns='_col', values='_val', aggfunc='first', dropna=False)
+                 .reset_index())
+        aligned = self.df[by].merge(modes, on=by, how='left')
+        aligned.index = self.df.index
+        return aligned.reindex(columns=cols)
+
 # %%
-    def clean_strings(self, columns=None, lowercase=True, strip=True, remove_extra_spaces=True, replace_na=''):
-        """ Normalise le texte (minuscules, strip, espaces multiples → un seul) """
+    @_profiled_step
+    def replace_null_tokens(self, columns=None, null_tokens: NullTokens = None):
+        """
+        Remplace les faux vides ('N/A', 'None', '-', 'inconnu'...) par NaN.
+        Un lookup par valeur unique, pas par ligne (voir NullTokens).
+        Astuce : read_csv_with_null_tokens() le fait dès le chargement du CSV.
+        """
+        null_tokens = null_tokens or NullTokens()
         target_cols = columns if columns else self.df.select_dtypes(include=['object', 'string']).columns
+        self._touch(target_cols)
 
         for col in target_cols:
-            if replace_na is not None:
-                self.df[col] = self.df[col].fillna(replace_na)
+            m = null_tokens.mask(self.df[col])
+            if m.any():
+                self.df[col] = self.df[col].mask(m)
+                self._log_action(f"Faux vides → NaN sur '{col}' : {int(m.sum())} valeurs")
 
-            if pd.api.types.is_object_dtype(self.df[col]) or pd.api.types.is_string_dtype(self.df[col]):
-                s = self.df[col].str
-                if lowercase:       s = s.lower()
-                if strip:           s = s.strip()
-                if remove_extra_spaces:
-                    s = s.replace(r'\s+', ' ', regex=True)
-                self.df[col] = s
+        return self
 
+# %%
+    @_profiled_step
+    def clean_strings(self, columns=None, lowercase=True, strip=True, remove_extra_spaces=True, replace_na=''):
+        """ Normalise le texte (minuscules, strip, espaces multiples → un seul) """
+        target_cols = columns if columns else self.df.select_dtypes(include=['object', 'string']).columns
+
+        target_cols = list(target_cols)
+        self._touch(target_cols)
+        results = self._map_columns(partial(_clean_string_column, lowercase=lowercase, strip=strip,
+                                            remove_extra_spaces=remove_extra_spaces, replace_na=replace_na),
+                                    target_cols)
+        for col, s in zip(target_cols, results):
+            self.df[col] = s
             self._log_action(f"Nettoyage texte '{col}' (lower={lowercase}, strip={strip}, extra_sp={remove_extra_spaces})")
 
         return self
 
 # %%
+    @_profiled_step
     def remove_accents(self, columns=None):
         """ Transforme é → e, ç → c, etc. """
-        import unicodedata
-
-        target_cols = columns if columns else self.df.select_dtypes(include=['object', 'string']).columns
+        target_cols = list(columns if columns else self.df.select_dtypes(include=['object', 'string']).columns)
+        self._touch(target_cols)
 
-        def strip_accents(s):
-            if pd.isna(s): return s
-            return ''.join(c for c in unicodedata.normalize('NFD', str(s))
-                           if unicodedata.category(c) != 'Mn')
-
-        for col in target_cols:
-            self.df[col] = self.df[col].apply(strip_accents)
+        for col, s in zip(target_cols, self._map_columns(_strip_accents_column, target_cols)):
+            self.df[col] = s
             self._log_action(f"Accents supprimés sur '{col}'")
 
         return self
 
 # %%
+    @_profiled_step
     def replace_in_strings(self, columns=None, to_replace: dict = None):
-        """ Remplacements texte personnalisés """
+        """
+        Remplacements texte personnalisés, en UN seul passage par colonne.
+
+        Toutes les clés de `to_replace` sont compilées en une regex unique
+        (mise en cache par dictionnaire), puis appliquées avec un lookup dict.
+        Sémantique « leftmost-longest » :
+          - on remplace la correspondance qui commence le plus à gauche
+          - à position égale, la clé la plus longue l'emporte
+            ex : {'par': 'X', 'paris': 'Y'} sur 'paris' → 'Y'
+          - le texte remplacé n'est PAS re-scanné (pas d'enchaînement
+            'a' → 'b' puis 'b' → 'c')
+        """
         if not to_replace:
             return self
 
+        pattern, mapping = _compile_replacer(tuple(to_replace.items()))
+        if not mapping:
+            return self
+
         target_cols = columns if columns else self.df.select_dtypes(include=['object', 'string']).columns
+        self._touch(target_cols)
 
         for col in target_cols:
-            for old, new in to_replace.items():
-                self.df[col] = self.df[col].str.replace(old, new, regex=False)
-            self._log_action(f"Remplacements sur '{col}' → {to_replace}")
+            self.df[col] = self.df[col].str.replace(pattern, lambda m: mapping[m.group(0)], regex=True)
+            self._log_action(f"Remplacements sur '{col}' → {len(mapping)} motifs (passage unique)")
+
+        return self
+
+# %%
+    @_profiled_step
+    def merge_similar_strings(self, columns=None, threshold=0.85, ngram=3, num_perm=64, bands=16,
+                              max_bucket=200):
+        """
+        Regroupe les variantes proches ("Marseille", "Marseile", "marseille.",
+        "MARSEILLE ") et les remplace par une valeur canonique (la plus fréquente
+        du groupe). Une faute sur un mot court pèse plus lourd : "Pariss" vs
+        "paris" = 0.83 < threshold par défaut (0.85), et leurs n-grammes
+        communs sont trop peu nombreux pour être candidats à coup sûr →
+        threshold=0.8, bands=32 pour ces cas.
+
+        1. clé normalisée (minuscules, sans accents, espaces compactés)
+        2. MinHash LSH sur les n-grammes de caractères des clés distinctes
+           (num_perm = bands × lignes par bande) → paires candidates seulement
+        3. distance d'édition normalisée ≥ threshold → même groupe (union-find)
+
+        Complexité ~ linéaire en nb de valeurs distinctes (hors buckets denses).
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm doit être un multiple de bands")
+
+        target_cols = columns if columns else self.df.select_dtypes(include=['object', 'string']).columns
+        self._touch(target_cols)
+
+        for col in target_cols:
+            counts = self.df[col].dropna().astype(str).value_counts()
+            if counts.empty:
+                continue
+            keys = pd.Series(counts.index.map(_normalize_key), index=counts.index)
+            distinct = keys.unique().tolist()
+
+            # Union-find sur les clés distinctes
+            parent = list(range(len(distinct)))
+
+            def find(i):
+                while parent[i] != i:
+                    parent[i] = parent[parent[i]]
+                    i = parent[i]
+                return i
+
+            if len(distinct) > 1:
+                signatures = _minhash_signatures(distinct, ngram, num_perm)
+                for x, y in _lsh_candidate_pairs(signatures, bands, max_bucket):
+                    rx, ry = find(x), find(y)
+                    if rx != ry and _levenshtein_ratio(distinct[x], distinct[y]) >= threshold:
+                        parent[ry] = rx
+
+            # Valeur canonique = valeur brute la plus fréquente de chaque groupe
+            key_index = {k: i for i, k in enumerate(distinct)}
+            cluster = keys.map(lambda k: find(key_index[k]))
+            canonical = counts.groupby(cluster.values).idxmax()
+            mapping = {raw: canonical[c] for raw, c in cluster.items() if raw != canonical[c]}
+
+            if mapping:
+                mask = self.df[col].notna()
+                values = self.df.loc[mask, col].astype(str)
+                self.df.loc[mask, col] = values.map(mapping).fillna(values)
+            self._log_action(f"Regroupement approché '{col}' → {len(mapping)} variantes fusionnées "
+                             f"sur {len(counts)} valeurs distinctes (seuil {threshold})")
 
         return self
 
 # %%
+    @_profiled_step
     def remove_outliers_iqr(self, columns=None, multiplier=1.5):
         """
         Supprime outliers avec méthode IQR :
@@ -156,6 +829,7 @@ class DataCleaner:
           borne haute = Q3 + multiplier × IQR
         """
         target_cols = columns if columns else self.df.select_dtypes(include=['number']).columns
+        self._touch(target_cols)
 
         for col in target_cols:
             Q1 = self.df[col].quantile(0.25)
@@ -173,18 +847,248 @@ class DataCleaner:
         return self
 
 # %%
-    def convert_types(self, type_dict: dict):
-        """ Convertit les types de colonnes """
-        for col, dtype in type_dict.items():
-            if col in self.df.columns:
-                try:
-                    if dtype == 'category':
-                        self.df[col] = self.df[col].astype('category')
-                    else:
-                        self.df[col] = pd.to_numeric(self.df[col], errors='coerce').astype(dtype)
-                    self._log_action(f"{col} → type converti en {dtype}")
-                except Exception as e:
-                    self._log_action(f"Erreur conversion {col} → {e}")
+    @_profiled_step
+    def convert_types(self, type_dict: dict = None, auto=False, columns=None,
+                      category_ratio=0.5, float_rtol=0.0):
+        """
+        Convertit les types de colonnes.
+
+        - type_dict → types imposés {colonne: dtype} ; un type entier sur une
+                      colonne avec NaN bascule sur son équivalent nullable (Int64...)
+        - auto=True → type le plus compact déduit pour chaque colonne de `columns`
+                      (toutes par défaut, hors celles de type_dict) :
+                        booléens ('oui'/'non', 'true'/'false'...) → boolean
+                        entiers → int8/16/32/64 (Int8... si NaN)
+                        décimaux → float32 si l'écart relatif reste ≤ float_rtol
+                                   (0 = uniquement les valeurs exactes en float32)
+                        texte → datetime si tout se parse, sinon category si
+                                nb valeurs uniques ≤ category_ratio × nb valeurs
+          Les octets gagnés sont journalisés.
+        """
+        type_dict = type_dict or {}
+        mem_before = self.df.memory_usage(index=False, deep=True)
+
+        cols = [col for col in type_dict if col in self.df.columns]
+        results = self._map_columns(_convert_column, cols, [type_dict[c] for c in cols])
+        labels = [type_dict[c] for c in cols]
+
+        if auto:
+            auto_cols = [c for c in (columns if columns else self.df.columns) if c not in type_dict]
+            results += self._map_columns(partial(_infer_tight_column, category_ratio=category_ratio,
+                                                 float_rtol=float_rtol), auto_cols)
+            cols += auto_cols
+            labels += [None] * len(auto_cols)
+
+        touched = []
+        for col, label, (converted, error) in zip(cols, labels, results):
+            if error is None:
+                # Auto : colonnes laissées telles quelles non journalisées ; type imposé : toujours
+                if label is not None or converted.dtype != self.df[col].dtype:
+                    touched.append(col)
+                    self._log_action(f"{col} → type converti en {label or converted.dtype}")
+                self.df[col] = converted
+            else:
+                self._log_action(f"Erreur conversion {col} → {error}")
+        self._touch(touched)
+
+        if auto:
+            saved = int(mem_before.sum() - self.df.memory_usage(index=False, deep=True).sum())
+            self._log_action(f"Conversion auto → {saved:,} octets économisés "
+                             f"({mem_before.sum():,} → {mem_before.sum() - saved:,})")
+        return self
+
+# %%
+    def fit(self, df: pd.DataFrame = None, missing_strategy='median', missing_columns=None,
+            outlier_columns=None, multiplier=1.5):
+        """
+        Apprend les paramètres de nettoyage SANS modifier les données :
+          - valeur d'imputation par colonne ('mean', 'median' ou 'mode')
+          - bornes IQR par colonne (Q1 - multiplier × IQR, Q3 + multiplier × IQR)
+
+        Idée : on fit une fois sur un historique de référence, puis on applique
+        les mêmes paramètres à chaque nouveau lot avec transform() → nettoyage
+        cohérent d'un lot à l'autre, sans recalculer les statistiques.
+        """
+        df = self.df if df is None else df
+        if missing_strategy not in ['mean', 'median', 'mode']:
+            raise ValueError("missing_strategy doit valoir 'mean', 'median' ou 'mode'")
+
+        numeric_cols = df.select_dtypes(include=['number']).columns
+        miss_cols = [c for c in (missing_columns if missing_columns else numeric_cols) if c in numeric_cols]
+        out_cols = [c for c in (outlier_columns if outlier_columns else numeric_cols) if c in numeric_cols]
+
+        # Un seul appel vectorisé par statistique, sur toutes les colonnes
+        if missing_strategy == 'mean':
+            fill_values = df[miss_cols].mean()
+        elif missing_strategy == 'median':
+            fill_values = df[miss_cols].median()
+        else:
+            modes = df[miss_cols].mode()
+            fill_values = modes.iloc[0] if not modes.empty else pd.Series(np.nan, index=miss_cols)
+
+        quartiles = df[out_cols].quantile([0.25, 0.75])
+        iqr = quartiles.loc[0.75] - quartiles.loc[0.25]
+        lower = quartiles.loc[0.25] - multiplier * iqr
+        upper = quartiles.loc[0.75] + multiplier * iqr
+
+        self.params = {
+            'missing_strategy': missing_strategy,
+            'fill_values': {c: _to_builtin(v) for c, v in fill_values.items()},
+            'multiplier': multiplier,
+            'iqr_bounds': {c: [_to_builtin(lower[c]), _to_builtin(upper[c])] for c in out_cols},
+        }
+        self._log_action(f"Fit → {len(miss_cols)} colonnes imputées ({missing_strategy}), "
+                         f"{len(out_cols)} bornes IQR (× {multiplier})")
+        return self
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Applique les paramètres appris par fit() à un nouveau DataFrame,
+        en un passage vectorisé (aucune statistique recalculée).
+        Retourne un NOUVEAU DataFrame nettoyé.
+        """
+        if not self.params:
+            raise ValueError("Aucun paramètre appris : appeler fit() ou load_params() d'abord")
+
+        fill_values = {c: v for c, v in self.params['fill_values'].items()
+                       if c in df.columns and v is not None}
+        for c, v in fill_values.items():
+            # Colonne entière (Int64) : valeur arrondie pour garder le type d'un chunk à l'autre
+            if pd.api.types.is_integer_dtype(df[c]) and isinstance(v, float):
+                fill_values[c] = round(v)
+        out = df.fillna(value=fill_values)
+
+        bounds = {c: b for c, b in self.params['iqr_bounds'].items()
+                  if c in out.columns and None not in b}
+        if bounds:
+            cols = list(bounds)
+            lower = pd.Series({c: b[0] for c, b in bounds.items()})
+            upper = pd.Series({c: b[1] for c, b in bounds.items()})
+            values = out[cols]
+            # Comme remove_outliers_iqr : un NaN restant échoue aux deux comparaisons → ligne retirée
+            keep = ((values >= lower) & (values <= upper)).all(axis=1)
+            out = out[keep]
+
+        self._log_action(f"Transform → {len(df) - len(out)} lignes retirées sur {len(df)}")
+        return out
+
+    def save_params(self, path: str):
+        """ Sauvegarde les paramètres appris (JSON si .json, sinon pickle) """
+        if path.endswith('.json'):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.params, f, ensure_ascii=False, indent=2)
+        else:
+            with open(path, 'wb') as f:
+                pickle.dump(self.params, f)
+        self._log_action(f"Paramètres sauvegardés → {path}")
+        return self
+
+    @classmethod
+    def load_params(cls, path: str, df: pd.DataFrame = None):
+        """ Recrée un DataCleaner à partir de paramètres sauvegardés par save_params() """
+        cleaner = cls(df)
+        if path.endswith('.json'):
+            with open(path, encoding='utf-8') as f:
+                cleaner.params = json.load(f)
+        else:
+            with open(path, 'rb') as f:
+                cleaner.params = pickle.load(f)
+        cleaner._log_action(f"Paramètres chargés ← {path}")
+        return cleaner
+
+# %%
+    def stream_csv_to_parquet(self, src: str, dst: str, chunksize=100_000, missing_strategy='median',
+                              missing_columns=None, outlier_columns=None, multiplier=1.5,
+                              drop_duplicates=True, sample_size=100_000, **read_csv_kwargs):
+        """
+        Nettoie un CSV plus gros que la RAM, chunk par chunk, vers un fichier Parquet.
+
+        - Types fixés une fois pour tout le fichier (sinon chaque chunk infère
+          les siens) : entiers dans TOUS les chunks → int64 (Int64 s'il y a
+          des vides, sans passer par float → identifiants longs exacts),
+          numériques → float64, le reste → string. `dtype=` (dict, comme
+          pd.read_csv) impose le type des colonnes voulues ; les autres sont inférées.
+        - Passe 1 (ignorée si fit() / load_params() a déjà été appelé et que
+            `dtype` couvre toutes les colonnes) :
+            moyennes exactes (sommes cumulées), médianes / quartiles / modes
+            estimés sur un échantillon réservoir borné à `sample_size` lignes
+        - Passe 2 : chaque chunk est lu avec ces types, dédoublonné (ensemble
+            de hash de lignes, donc aussi entre chunks), transformé avec les
+            paramètres appris, puis écrit comme un row group Parquet
+
+        Mémoire bornée : un chunk + l'échantillon + le set Python des hash de
+        lignes uniques (~70 octets par ligne unique).
+        Nécessite pyarrow.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        dtypes = dict(read_csv_kwargs.pop('dtype', None) or {})
+        header = pd.read_csv(src, nrows=0, **read_csv_kwargs).columns
+
+        # ── Passe 1 : types + statistiques ─────────────────────
+        if not self.params or not set(header) <= set(dtypes):
+            samples, sums, counts = {}, {}, {}
+            kinds, has_na = {}, dict.fromkeys(header, False)
+            # Types nullables : un entier avec des vides reste Int64 au lieu d'être lu en float
+            infer_kwargs = {**read_csv_kwargs, 'dtype_backend': 'numpy_nullable'}
+            for chunk in pd.read_csv(src, chunksize=chunksize, dtype=dtypes or None, **infer_kwargs):
+                for col in chunk.columns:
+                    na = chunk[col].isna()
+                    has_na[col] = has_na[col] or bool(na.any())
+                    if not na.all():                # colonne vide dans ce chunk : pas d'avis
+                        kinds[col] = max(kinds.get(col, 0), _column_kind(chunk[col]))
+                if self.params:
+                    continue
+                for col in chunk.select_dtypes(include=['number']).columns:
+                    arr = chunk[col].to_numpy(dtype='float64', na_value=np.nan)
+                    samples.setdefault(col, _ReservoirSample(sample_size)).update(arr)
+                    sums[col] = sums.get(col, 0.0) + np.nansum(arr)
+                    counts[col] = counts.get(col, 0) + int((~np.isnan(arr)).sum())
+            for col in header:
+                kind = kinds.get(col, 1)            # colonne entièrement vide → float64
+                if kind == 0:
+                    dtypes.setdefault(col, 'Int64' if has_na[col] else 'int64')
+                else:
+                    dtypes.setdefault(col, 'float64' if kind == 1 else 'string')
+
+            if not self.params:
+                # Une colonne numérique dans certains chunks seulement n'est pas numérique
+                sample_df = pd.DataFrame({col: pd.Series(r.to_array()) for col, r in samples.items()
+                                          if pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(dtypes[col]))})
+                self.fit(sample_df, missing_strategy=missing_strategy, missing_columns=missing_columns,
+                         outlier_columns=outlier_columns, multiplier=multiplier)
+                if missing_strategy == 'mean':
+                    for col in self.params['fill_values']:
+                        self.params['fill_values'][col] = sums[col] / counts[col] if counts[col] else None
+
+        # ── Passe 2 : dédoublonnage + transform + écriture ─────
+        seen_hashes = set()
+        writer, schema = None, None
+        rows_in = rows_out = 0
+        try:
+            for chunk in pd.read_csv(src, chunksize=chunksize, dtype=dtypes, **read_csv_kwargs):
+                rows_in += len(chunk)
+                if drop_duplicates:
+                    hashes = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+                    is_new = ~pd.Series(hashes).duplicated().to_numpy()
+                    is_new &= np.fromiter((h not in seen_hashes for h in hashes), dtype=bool, count=len(hashes))
+                    seen_hashes.update(hashes[is_new].tolist())
+                    chunk = chunk[is_new]
+
+                chunk = self.transform(chunk)
+                rows_out += len(chunk)
+
+                if writer is None:
+                    schema = pa.Table.from_pandas(chunk, preserve_index=False).schema
+                    writer = pq.ParquetWriter(dst, schema)
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        finally:
+            if writer is not None:
+                writer.close()
+
+        self._log_action(f"Streaming {src} → {dst} : {rows_in} lignes lues, {rows_out} écrites "
+                         f"(chunks de {chunksize})")
         return self
 
 # %%
@@ -199,6 +1103,14 @@ class DataCleaner:
         print(f"Dimensions        : {self.df.shape}")
         print(f"NaN restants      : {self.df.isna().sum().sum()}")
         print(f"Doublons restants : {self.df.duplicated().sum()}")
+        if self.steps:
+            total = sum(e['wall_time_s'] for e in self.steps) or 1.0
+            print("\nTemps par étape :")
+            for e in self.steps:
+                print(f"  {e['step']:<22} {e['wall_time_s'] * 1000:9.1f} ms "
+                      f"({e['wall_time_s'] / total * 100:5.1f} %) | "
+                      f"lignes {e['rows_before']} → {e['rows_after']} | "
+                      f"mémoire {e['memory_delta_bytes']:+,} o")
         print("\nHistorique des opérations :")
         print(self.get_log())
         print("="*50)
@@ -207,30 +1119,31 @@ class DataCleaner:
 # %%
 # ──── EXEMPLE D'UTILISATION ────────────────────────────────────────────────
 
-data = {
-    'Nom': ['  Alice  ', 'Bob   ', '  ÇA VA ?', None, 'ÉMILIE'],
-    'Ville': ['Paris  ', ' paris', 'LYON   ', 'Marseille', None],
-    'Age': [25, 30, None, 28, 999],
-    'Salaire': [2500.5, 3000, None, 2800, 12000]
-}
-df = pd.DataFrame(data)
+# Sous __main__ : les workers de _map_columns (n_jobs > 1, méthode « spawn »
+# sous macOS / Windows) réimportent ce module et ne doivent pas relancer l'exemple
+if __name__ == '__main__':
+    data = {
+        'Nom': ['  Alice  ', 'Bob   ', '  ÇA VA ?', None, 'ÉMILIE'],
+        'Ville': ['Paris  ', ' paris', 'LYON   ', ' N/A ', None],
+        'Age': [25, 30, None, 28, 999],
+        'Salaire': [2500.5, 3000, None, 2800, 12000]
+    }
+    df = pd.DataFrame(data)
 
-# %%
-cleaner = DataCleaner(df)
+    cleaner = DataCleaner(df)
 
-# %%
-cleaned = (
-    cleaner
-    .drop_duplicates()
-    .handle_missing(strategy='median', columns=['Age', 'Salaire'])
-    .clean_strings(lowercase=True, strip=True, remove_extra_spaces=True, replace_na='')
-    .remove_accents()
-    .replace_in_strings(to_replace={'ça va ?': 'comment vas-tu ?', 'lyon': 'Lyon'})
-    .remove_outliers_iqr(columns=['Salaire'], multiplier=2.0)
-    .convert_types({'Age': 'int', 'Salaire': 'float'})
-    .summary()
-    .get_cleaned_df()
-)
+    cleaned = (
+        cleaner
+        .drop_duplicates()
+        .handle_missing(strategy='median', columns=['Age', 'Salaire'])
+        .replace_null_tokens()
+        .clean_strings(lowercase=True, strip=True, remove_extra_spaces=True, replace_na='')
+        .remove_accents()
+        .replace_in_strings(to_replace={'ça va ?': 'comment vas-tu ?', 'lyon': 'Lyon'})
+        .remove_outliers_iqr(columns=['Salaire'], multiplier=2.0)
+        .convert_types({'Age': 'int', 'Salaire': 'float'})
+        .summary()
+        .get_cleaned_df()
+    )
 
-# %%
-cleaned
\ No newline at end of file
+    print(cleaned)
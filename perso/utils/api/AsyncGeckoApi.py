@@ -0,0 +1,141 @@
+import asyncio
+import json
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple
+from urllib.parse import urlencode
+
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError
+
+import pandas as pd
+
+from perso.utils.api.MyGeckoApi import format_ohlc_dates, ohlc_to_frame, prepare_request
+from perso.utils.api.RateLimiter import RateLimiter
+from perso.utils.api.ResponseCache import ResponseCache
+from perso.utils.api.SingleFlight import AsyncSingleFlight
+
+
+class AsyncGeckoApi:
+    """
+    Équivalent asyncio de MyGeckoApi : les requêtes OHLC par coin_id partent
+    en parallèle, avec au plus `max_in_flight` requêtes en cours à la fois
+    (pour rester sous la limite de débit de CoinGecko).
+
+    Mêmes payloads et même forme de retour que MyGeckoApi.
+
+    Exemple :
+        api = AsyncGeckoApi(api_key=my_api_key, max_in_flight=8)
+        ohlc_dict = await api.get_ohlc_data_date({"coin_id": coin_ids, "days": 365, "vs_currency": "usd"})
+
+        async for coin_id, ohlc in api.iter_ohlc_data(params2):   # dans l'ordre d'arrivée
+            print(coin_id, len(ohlc))
+    """
+
+    def __init__(self, api_key: str = None, max_in_flight: int = 10, timeout: float = 15,
+                 rate_limiter: RateLimiter = None, coalesce: bool = True,
+                 root_url: str = "https://api.coingecko.com/api/v3/"):
+        self.api_key = api_key
+        self.root_url = root_url
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter             # peut être partagé avec un MyGeckoApi
+        self._single_flight = AsyncSingleFlight() if coalesce else None
+        self._semaphore = None
+        self._client = None
+
+    def _get_client(self) -> AsyncHTTPClient:
+        # Créés à la première requête : ils doivent appartenir à la boucle asyncio en cours
+        if self._client is None:
+            self._client = AsyncHTTPClient(force_instance=True, max_clients=self.max_in_flight)
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._client
+
+    def close(self):
+        """ Ferme le client HTTP """
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Any:
+        """
+        Méthode interne réutilisable pour factoriser les requêtes
+        (requêtes identiques simultanées regroupées si coalesce=True)
+        """
+        if self._single_flight is None:
+            return await self._fetch(endpoint, params)
+        key = ResponseCache.make_key(endpoint, params)
+        return await self._single_flight.do(key, lambda: self._fetch(endpoint, params))
+
+    async def _fetch(self, endpoint: str, params: Optional[Dict] = None) -> Any:
+        """ Requête réseau (limite de requêtes en cours + rate limiter) """
+        url, payload = prepare_request(self.root_url, endpoint, params, self.api_key)
+        client = self._get_client()
+
+        full_url = f"{url}?{urlencode(payload, doseq=True)}"
+        max_retries = self.rate_limiter.max_retries if self.rate_limiter else 0
+
+        async with self._semaphore:
+            try:
+                for attempt in range(max_retries + 1):
+                    if self.rate_limiter:
+                        await self.rate_limiter.acquire_async()
+                    try:
+                        response = await client.fetch(full_url, request_timeout=self.timeout,
+                                                      decompress_response=True)
+                        break
+                    except HTTPClientError as e:
+                        if e.code != 429 or attempt == max_retries:
+                            raise
+                        retry_after = e.response.headers.get("Retry-After") if e.response is not None else None
+                        self.rate_limiter.on_rate_limited(retry_after, attempt)
+            except HTTPClientError as e:
+                body = e.response.body.decode(errors="replace") if e.response is not None and e.response.body else ""
+                raise Exception(f"Erreur CoinGecko API ({e.code}): {body or str(e)}") from e
+            except OSError as e:
+                raise Exception(f"Erreur CoinGecko API (connexion): {e}") from e
+        return json.loads(response.body)
+
+    async def get_crypto_currencies_list(self, payload: Dict = None) -> List[Dict]:
+        """ Voir MyGeckoApi.get_crypto_currencies_list """
+        return await self._make_request("coins/markets", payload or {})
+
+    async def iter_ohlc_data(self, payload: Dict = None, dates: bool = False) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Lance les requêtes OHLC de tous les coin_id et renvoie (coin_id, données)
+        au fur et à mesure qu'elles se terminent (ordre d'arrivée, pas d'entrée).
+        dates=True → même format que get_ohlc_data_date.
+        """
+        if payload is None:
+            payload = {}
+        if len(payload.get("coin_id") or []) == 0:
+            raise ValueError("coin_id must be provided for OHLC data retrieval.")
+
+        async def fetch(coin_id):
+            data = await self._make_request(f"coins/{coin_id}/ohlc", payload)
+            return coin_id, format_ohlc_dates(data) if dates else data
+
+        tasks = [asyncio.ensure_future(fetch(coin_id)) for coin_id in payload["coin_id"]]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Arrêt anticipé (break, exception) → on annule ce qui reste
+            for task in tasks:
+                task.cancel()
+
+    async def get_ohlc_data(self, payload: Dict = None) -> Dict:
+        """ Voir MyGeckoApi.get_ohlc_data (même forme, requêtes concurrentes) """
+        return await self._collect_ohlc(payload, dates=False)
+
+    async def get_ohlc_data_date(self, payload: Dict = None) -> Dict:
+        """ Voir MyGeckoApi.get_ohlc_data_date (même forme, requêtes concurrentes) """
+        return await self._collect_ohlc(payload, dates=True)
+
+    async def get_ohlc_dataframe(self, payload: Dict = None) -> pd.DataFrame:
+        """ Voir MyGeckoApi.get_ohlc_dataframe """
+        return ohlc_to_frame(await self.get_ohlc_data(payload))
+
+    async def _collect_ohlc(self, payload: Dict, dates: bool) -> Dict:
+        results = {coin_id: data async for coin_id, data in self.iter_ohlc_data(payload, dates)}
+        if results == {}:
+            raise ValueError("No OHLC data retrieved for the provided coin_id(s).")
+        # Même ordre de clés que l'appel synchrone
+        return {coin_id: results[coin_id] for coin_id in payload["coin_id"]}
@@ -0,0 +1,163 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+DEFAULT_FIXTURE = Path(__file__).resolve().parents[3] / "profs" / "crypto_data.json"
+
+
+class _Server(ThreadingHTTPServer):
+    request_queue_size = 128                # backlog par défaut (5) → SYN retransmis sous charge
+
+
+class FakeGeckoServer:
+    """
+    Serveur HTTP local qui imite CoinGecko (hors ligne, sans quota) pour tester
+    et mesurer MyGeckoApi / AsyncGeckoApi.
+
+    Endpoints servis à partir d'un fichier de fixtures (profs/crypto_data.json
+    par défaut, format {coin_id: {'YYYY-MM-DD': [o, h, l, c]}}) :
+        /api/v3/coins/markets?per_page=&page=
+        /api/v3/coins/{id}/ohlc?days=
+
+    Paramètres de simulation :
+        latency        délai ajouté à chaque réponse (secondes)
+        jitter         délai aléatoire supplémentaire dans [0, jitter]
+        rate_per_minute  au-delà → 429 avec en-tête Retry-After (None = illimité)
+        error_rate     probabilité de répondre 500
+
+    Exemple :
+        with FakeGeckoServer(latency=0.05, rate_per_minute=600) as server:
+            api = MyGeckoApi(root_url=server.root_url)
+            api.get_ohlc_data({"coin_id": ["bitcoin"], "days": 30, "vs_currency": "usd"})
+    """
+
+    def __init__(self, fixture_path=DEFAULT_FIXTURE, host="127.0.0.1", port=0, latency=0.0,
+                 jitter=0.0, rate_per_minute=None, error_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_per_minute = rate_per_minute
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self.stats = {"requests": 0, "429": 0, "500": 0}
+        self._ohlc, self._markets = self._load_fixture(fixture_path)
+        self._httpd = _Server((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @staticmethod
+    def _load_fixture(path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        ohlc, markets = {}, []
+        for rank, (coin_id, by_date) in enumerate(data.items(), start=1):
+            ts = pd.to_datetime(list(by_date.keys())).to_numpy(dtype="datetime64[ms]").astype("int64")
+            ohlc[coin_id] = [[int(t), *values] for t, values in zip(ts, by_date.values())]
+            last_close = ohlc[coin_id][-1][4] if ohlc[coin_id] else None
+            markets.append({"id": coin_id, "symbol": coin_id[:4], "name": coin_id.title(),
+                            "current_price": last_close, "market_cap_rank": rank})
+        return ohlc, markets
+
+    @property
+    def root_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/api/v3/"
+
+    def start(self) -> "FakeGeckoServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset(self) -> None:
+        """ Remet à zéro la fenêtre de rate_per_minute et les compteurs (entre deux scénarios) """
+        with self._lock:
+            self._window_start = time.monotonic()
+            self._window_count = 0
+            self.stats = {"requests": 0, "429": 0, "500": 0}
+
+    def _admit(self):
+        """ Statut à renvoyer (200, 429, 500) + Retry-After éventuel """
+        with self._lock:
+            self.stats["requests"] += 1
+            if self.rate_per_minute:
+                now = time.monotonic()
+                if now - self._window_start >= 60:
+                    self._window_start, self._window_count = now, 0
+                self._window_count += 1
+                if self._window_count > self.rate_per_minute:
+                    self.stats["429"] += 1
+                    return 429, max(1, int(60 - (now - self._window_start)) + 1)
+            if self.error_rate and self._rng.random() < self.error_rate:
+                self.stats["500"] += 1
+                return 500, None
+        return 200, None
+
+    def _route(self, path, query):
+        """ (statut, corps JSON) pour une requête admise """
+        parts = path.strip("/").split("/")
+        if parts[:2] != ["api", "v3"]:
+            return 404, {"error": "not found"}
+        parts = parts[2:]
+        if parts == ["coins", "markets"]:
+            per_page = int(query.get("per_page", ["100"])[0])
+            page = int(query.get("page", ["1"])[0])
+            return 200, self._markets[(page - 1) * per_page:page * per_page]
+        if len(parts) == 3 and parts[0] == "coins" and parts[2] == "ohlc":
+            rows = self._ohlc.get(parts[1])
+            if rows is None:
+                return 404, {"error": "coin not found"}
+            days = query.get("days", ["max"])[0]
+            if days != "max" and rows:
+                since = rows[-1][0] - int(float(days) * 86_400_000)
+                rows = [r for r in rows if r[0] >= since]
+            return 200, rows
+        return 404, {"error": "not found"}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"       # keep-alive, comme l'API réelle
+            disable_nagle_algorithm = True      # sinon ~40 ms de délai (en-têtes + corps = 2 écritures)
+
+            def do_GET(self):
+                delay = server.latency + (server._rng.uniform(0, server.jitter) if server.jitter else 0)
+                if delay:
+                    time.sleep(delay)
+                status, retry_after = server._admit()
+                if status == 200:
+                    url = urlparse(self.path)
+                    status, body = server._route(url.path, parse_qs(url.query))
+                else:
+                    body = {"status": {"error_code": status, "error_message": "simulated error"}}
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                if retry_after:
+                    self.send_header("Retry-After", str(retry_after))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass                            # pas de log par requête
+
+        return Handler
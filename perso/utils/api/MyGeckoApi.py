@@ -1,32 +1,164 @@
 import requests
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from perso.utils.api.RateLimiter import RateLimiter
+from perso.utils.api.ResponseCache import ResponseCache
+from perso.utils.api.SingleFlight import SingleFlight
+
+def prepare_request(root_url: str, endpoint: str, params: Optional[Dict] = None, api_key: str = None):
+    """
+    URL et paramètres (clé API incluse) d'une requête CoinGecko
+    — partagé par MyGeckoApi et AsyncGeckoApi
+    """
+    url = root_url + endpoint
+    
+    # On prépare les paramètres
+    payload = params.copy() if params else {}
+    
+    # On ajoute la clé API si elle existe et qu'elle n'est pas déjà présente
+    if api_key and "x_cg_demo_api_key" not in payload:
+        payload["x_cg_demo_api_key"] = api_key
+    return url, payload
+
 
 class MyGeckoApi:
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, pool_size: int = 10, max_retries: int = 3,
+                 backoff_factor: float = 0.5, timeout: float = 15, rate_limiter: RateLimiter = None,
+                 cache: ResponseCache = None, coalesce: bool = True,
+                 root_url: str = "https://api.coingecko.com/api/v3/"):
+        """
+        Client CoinGecko basé sur une requests.Session persistante :
+        - connexions TCP/TLS réutilisées (keep-alive, pool de `pool_size` connexions)
+        - réponses compressées (gzip) demandées au serveur
+        - nouvelles tentatives automatiques sur 429 / 5xx avec attente exponentielle
+          (backoff_factor × 2^n secondes) et respect de l'en-tête Retry-After
+        - rate_limiter : RateLimiter partagé (ex : RateLimiter.from_plan("demo")) qui
+          cadence les requêtes et prend alors en charge les 429
+        - cache : ResponseCache (mémoire + SQLite) ; une entrée périmée depuis peu
+          est servie tout de suite et rafraîchie en arrière-plan
+        - coalesce : des appels identiques lancés en même temps par plusieurs threads
+          partagent une seule requête réseau (et donc le même objet résultat)
+        - root_url : à changer pour viser un serveur local (ex : FakeGeckoServer)
+        """
         self.api_key = api_key
-        self.root_url = "https://api.coingecko.com/api/v3/"
+        self.root_url = root_url
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self._single_flight = SingleFlight() if coalesce else None
+        self._revalidating = set()          # clés en cours de rafraîchissement
+        self._revalidating_lock = threading.Lock()
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            # Avec un limiteur, les 429 sont gérés par lui (blocage partagé entre threads)
+            status_forcelist=(500, 502, 503, 504) if rate_limiter else (429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,      # la dernière réponse est renvoyée → raise_for_status
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        })
+
+    def close(self):
+        """ Ferme les connexions du pool """
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _prepare_request(self, endpoint: str, params: Optional[Dict] = None):
+        """ Construit l'URL et les paramètres (clé API incluse) d'une requête """
+        return prepare_request(self.root_url, endpoint, params, self.api_key)
 
     def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Any:
         """
         Méthode interne réutilisable pour factoriser les requêtes
+        (passe par le cache s'il est configuré)
         """
-        url = self.root_url + endpoint
-        
-        # On prépare les paramètres
-        payload = params.copy() if params else {}
-        
-        # On ajoute la clé API si elle existe et qu'elle n'est pas déjà présente
-        if self.api_key and "x_cg_demo_api_key" not in payload:
-            payload["x_cg_demo_api_key"] = self.api_key
+        key = ResponseCache.make_key(endpoint, params)
+        if self.cache is None:
+            return self._fetch_coalesced(key, endpoint, params)
+
+        hit = self.cache.get(key)
+        if hit is not None:
+            value, fresh = hit
+            if not fresh:
+                self._revalidate_in_background(key, endpoint, params)
+            return value
+
+        value = self._fetch_coalesced(key, endpoint, params)
+        self.cache.set(key, endpoint, value)
+        return value
+
+    def _fetch_coalesced(self, key: str, endpoint: str, params: Optional[Dict]) -> Any:
+        """ _fetch, partagé entre threads qui demandent la même clé au même moment """
+        if self._single_flight is None:
+            return self._fetch(endpoint, params)
+        return self._single_flight.do(key, lambda: self._fetch(endpoint, params))
+
+    def _revalidate_in_background(self, key: str, endpoint: str, params: Optional[Dict]) -> None:
+        """ Rafraîchit une entrée périmée dans un thread (un seul par clé) """
+        with self._revalidating_lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def refresh():
+            try:
+                self.cache.set(key, endpoint, self._fetch_coalesced(key, endpoint, params))
+            except Exception:
+                pass                        # l'entrée périmée reste servie jusqu'à la fin de sa période stale
+            finally:
+                with self._revalidating_lock:
+                    self._revalidating.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _fetch(self, endpoint: str, params: Optional[Dict] = None) -> Any:
+        """ Requête réseau (sans cache) """
+        url, payload = self._prepare_request(endpoint, params)
 
         try:
-            response = requests.get(url, params=payload, timeout=15)
+            response = self._get_paced(url, payload)
             response.raise_for_status()  # Lève une exception pour les codes 4xx/5xx
             return response.json()
+        except requests.exceptions.HTTPError as e:
+            raise Exception(f"Erreur CoinGecko API ({e.response.status_code}): {e.response.text or str(e)}") from e
         except requests.exceptions.RequestException as e:
-            raise Exception(f"Erreur CoinGecko API ({response.status_code}): {response.text or str(e)}")
+            # Pas de réponse (connexion, timeout, retries épuisés...) → pas de status_code
+            raise Exception(f"Erreur CoinGecko API (connexion): {e}") from e
+
+    def _get_paced(self, url: str, payload: Dict) -> requests.Response:
+        """ GET cadencé par le rate_limiter, avec nouvelles tentatives sur 429 """
+        if self.rate_limiter is None:
+            return self.session.get(url, params=payload, timeout=self.timeout)
+
+        for attempt in range(self.rate_limiter.max_retries + 1):
+            self.rate_limiter.acquire()
+            response = self.session.get(url, params=payload, timeout=self.timeout)
+            if response.status_code != 429:
+                break
+            self.rate_limiter.on_rate_limited(response.headers.get("Retry-After"), attempt)
+        return response
 
     # ────────────────────────────────────────────────
     # Méthodes existantes / déjà écrites
@@ -63,6 +195,47 @@ class MyGeckoApi:
             payload = {}
         return self._make_request("coins/markets", payload)
 
+    # ────────────────────────────────────────────────
+    # Parcourt TOUTES les pages de coins/markets, page par page (générateur) :
+    # la page suivante est téléchargée pendant que l'appelant traite la courante
+    # ────────────────────────────────────────────────
+    def iter_crypto_currencies_pages(self, payload: Dict = None, start_page: int = 1,
+                                     max_pages: int = None, as_frame: bool = False) -> Iterator:
+        """
+        Générateur des pages de get_crypto_currencies_list : page=start_page, +1, ...
+        jusqu'à une page vide (ou max_pages pages).
+
+        - une seule page en mémoire à la fois + la suivante en préchargement
+        - as_frame=True → chaque page est renvoyée en DataFrame
+
+        Exemple (vers Parquet, sans garder toutes les pages) :
+            import pyarrow as pa, pyarrow.parquet as pq
+            writer = None
+            for page_df in api.iter_crypto_currencies_pages({'vs_currency': 'usd', 'per_page': 250}, as_frame=True):
+                table = pa.Table.from_pandas(page_df, preserve_index=False)
+                writer = writer or pq.ParquetWriter("markets.parquet", table.schema)
+                writer.write_table(table.cast(writer.schema))
+            writer.close()
+        """
+        payload = dict(payload or {})
+        payload.setdefault("per_page", 250)
+
+        def fetch(page):
+            return self.get_crypto_currencies_list({**payload, "page": page})
+
+        last_page = start_page + max_pages - 1 if max_pages else None
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            page = start_page
+            pending = prefetcher.submit(fetch, page)
+            while pending is not None:
+                rows = pending.result()
+                if not rows:
+                    break
+                # Préchargement de la page suivante avant de rendre la main
+                page += 1
+                pending = prefetcher.submit(fetch, page) if last_page is None or page <= last_page else None
+                yield pd.DataFrame(rows) if as_frame else rows
+
     # ────────────────────────────────────────────────
     # Fourni les données OHLC pour une ou plusieurs cryptos, en fonction des paramètres fournis
     #  sous forme d'un dictionnaire de listes, avec les données au format origine
@@ -82,6 +255,18 @@ class MyGeckoApi:
             raise ValueError("No OHLC data retrieved for the provided coin_id(s).")
         return ohlc_dict
     # ────────────────────────────────────────────────
+    # Versions colonnes : un DataFrame pour tous les coins, ou un record array
+    # numpy par coin — conversion des dates en un seul appel vectorisé
+    # ────────────────────────────────────────────────
+    def get_ohlc_dataframe(self, payload: Dict = None) -> pd.DataFrame:
+        """ Données OHLC de tous les coin_id dans un seul DataFrame (colonne coin_id) """
+        return ohlc_to_frame(self.get_ohlc_data(payload))
+
+    def get_ohlc_records(self, payload: Dict = None) -> Dict[str, np.ndarray]:
+        """ {coin_id: record array (timestamp, open, high, low, close)} """
+        return {coin_id: ohlc_to_records(rows) for coin_id, rows in self.get_ohlc_data(payload).items()}
+
+    # ────────────────────────────────────────────────
     # Fourni les données OHLC pour une ou plusieurs cryptos, en fonction des paramètres fournis
     #  sous forme d'un dictionnaire de dictionnaires, avec les dates en format 
     # YYYY-MM-DD et les valeurs OHLC associées
@@ -96,17 +281,60 @@ class MyGeckoApi:
             coins_ids=payload.get("coin_id")
             ohlc_dict = {}
             for coin_id in coins_ids:
-                ohlc_dict[coin_id] = {}
                 ohlc_curr=(self._make_request(f"coins/{coin_id}/ohlc", payload))
-                for ts,open_, high, low, close in ohlc_curr:
-                    ts=pd.to_datetime(ts, unit='ms').strftime('%Y-%m-%d')
-                    ohlc_dict[coin_id][str(ts)] = [open_, high, low, close]
+                ohlc_dict[coin_id] = format_ohlc_dates(ohlc_curr)
                 
         if ohlc_dict == {}:
             raise ValueError("No OHLC data retrieved for the provided coin_id(s).")
         return ohlc_dict
         
         
+OHLC_DTYPE = np.dtype([('timestamp', 'datetime64[ms]'), ('open', 'f8'), ('high', 'f8'),
+                       ('low', 'f8'), ('close', 'f8')])
+
+
+def ohlc_to_array(ohlc_curr: List) -> np.ndarray:
+    """ [[ts_ms, o, h, l, c], ...] → tableau numpy (n × 5) float64, sans boucle Python par bougie """
+    arr = np.asarray(ohlc_curr, dtype='float64')
+    return arr.reshape(-1, 5)
+
+
+def format_ohlc_dates(ohlc_curr: List) -> Dict:
+    """ [[ts_ms, o, h, l, c], ...] → {'YYYY-MM-DD': [o, h, l, c], ...} """
+    arr = ohlc_to_array(ohlc_curr)
+    # Une seule conversion vectorisée pour toutes les dates
+    dates = pd.to_datetime(arr[:, 0].astype('int64'), unit='ms').strftime('%Y-%m-%d')
+    return dict(zip(dates, arr[:, 1:].tolist()))
+
+
+def ohlc_to_records(ohlc_curr: List) -> np.ndarray:
+    """ Bougies d'un coin → record array numpy (timestamp, open, high, low, close) """
+    arr = ohlc_to_array(ohlc_curr)
+    records = np.empty(len(arr), dtype=OHLC_DTYPE)
+    records['timestamp'] = arr[:, 0].astype('int64').astype('datetime64[ms]')
+    for i, field in enumerate(['open', 'high', 'low', 'close'], start=1):
+        records[field] = arr[:, i]
+    return records.view(np.recarray)
+
+
+def ohlc_to_frame(ohlc_dict: Dict) -> pd.DataFrame:
+    """
+    {coin_id: [[ts_ms, o, h, l, c], ...]} (sortie de get_ohlc_data) → un seul
+    DataFrame long : coin_id (category), timestamp (datetime64), open, high, low, close
+    """
+    arrays = [ohlc_to_array(rows) for rows in ohlc_dict.values()]
+    lengths = [len(a) for a in arrays]
+    stacked = np.concatenate(arrays) if arrays else np.empty((0, 5))
+    return pd.DataFrame({
+        'coin_id': pd.Categorical(np.repeat(list(ohlc_dict.keys()), lengths), categories=list(ohlc_dict.keys())),
+        'timestamp': pd.to_datetime(stacked[:, 0].astype('int64'), unit='ms'),
+        'open': stacked[:, 1],
+        'high': stacked[:, 2],
+        'low': stacked[:, 3],
+        'close': stacked[:, 4],
+    })
+
+
 """        
  EXEMPLES D4UTILISATION DE LA CLASSE MyGeckoApi
 """
@@ -0,0 +1,120 @@
+import sqlite3
+import threading
+import time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from perso.utils.api.MyGeckoApi import MyGeckoApi, ohlc_to_array
+
+# L'endpoint coins/{id}/ohlc n'accepte que certaines valeurs de `days`, et la
+# taille des bougies en dépend :  1-2 j → 30 min, 3-30 j → 4 h, 31 j et + → 4 jours.
+# On stocke donc l'historique par résolution, et chaque résolution a ses `days` possibles.
+RESOLUTIONS = {
+    "30m": [1],
+    "4h": [7, 14, 30],
+    "4d": [90, 180, 365],
+}
+_MS_PER_DAY = 86_400_000
+
+
+def resolution_for(days: int) -> str:
+    """ Résolution des bougies renvoyées par CoinGecko pour un `days` donné """
+    if days <= 2:
+        return "30m"
+    if days <= 30:
+        return "4h"
+    return "4d"
+
+
+class OhlcHistoryStore:
+    """
+    Historique OHLC local (SQLite) par coin / devise / résolution, mis à jour
+    de façon incrémentale : sync() ne télécharge que la fenêtre manquante
+    depuis la dernière bougie stockée, puis ajoute en dédoublonnant par timestamp
+    (la dernière bougie, encore en cours, est simplement remplacée).
+
+    Exemple :
+        store = OhlcHistoryStore("ohlc_history.sqlite", MyGeckoApi(api_key=my_api_key))
+        store.sync(coin_ids, vs_currency="usd", days=365)   # 1er appel : 365 j ; ensuite : quelques jours
+        df = store.load(coin_ids, vs_currency="usd", days=365)
+    """
+
+    def __init__(self, path: str, api: MyGeckoApi):
+        self.api = api
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS ohlc (
+                coin_id TEXT, vs_currency TEXT, resolution TEXT, ts INTEGER,
+                open REAL, high REAL, low REAL, close REAL,
+                PRIMARY KEY (coin_id, vs_currency, resolution, ts)
+            ) WITHOUT ROWID
+        """)
+        self._db.commit()
+
+    def last_timestamp(self, coin_id: str, vs_currency: str, resolution: str):
+        """ Timestamp (ms) de la dernière bougie stockée, ou None """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT MAX(ts) FROM ohlc WHERE coin_id = ? AND vs_currency = ? AND resolution = ?",
+                (coin_id, vs_currency, resolution)).fetchone()
+        return row[0]
+
+    def days_to_fetch(self, coin_id: str, vs_currency: str, days: int):
+        """
+        Plus petite fenêtre `days` autorisée couvrant le trou depuis la
+        dernière bougie (None si l'historique est déjà à jour).
+        """
+        resolution = resolution_for(days)
+        last = self.last_timestamp(coin_id, vs_currency, resolution)
+        if last is None:
+            return days
+        gap_days = (time.time() * 1000 - last) / _MS_PER_DAY
+        if resolution == "4d" and gap_days < 4:
+            return None                         # pas encore de nouvelle bougie de 4 jours
+        for candidate in RESOLUTIONS[resolution]:
+            if candidate >= gap_days + 1 and candidate <= days:
+                return candidate
+        return days
+
+    def sync(self, coin_ids: List[str], vs_currency: str = "usd", days: int = 365) -> Dict[str, int]:
+        """ Met à jour l'historique de chaque coin ; retourne {coin_id: nb bougies reçues} """
+        resolution = resolution_for(days)
+        received = {}
+        for coin_id in coin_ids:
+            fetch_days = self.days_to_fetch(coin_id, vs_currency, days)
+            if fetch_days is None:
+                received[coin_id] = 0
+                continue
+            rows = self.api._make_request(f"coins/{coin_id}/ohlc",
+                                          {"vs_currency": vs_currency, "days": fetch_days})
+            received[coin_id] = self.append(coin_id, vs_currency, resolution, rows)
+        return received
+
+    def append(self, coin_id: str, vs_currency: str, resolution: str, rows: List) -> int:
+        """ Ajoute des bougies [[ts_ms, o, h, l, c], ...] (remplace les timestamps déjà présents) """
+        arr = ohlc_to_array(rows)
+        records = [(coin_id, vs_currency, resolution, int(ts), o, h, l, c) for ts, o, h, l, c in arr.tolist()]
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO ohlc VALUES (?, ?, ?, ?, ?, ?, ?, ?)", records)
+            self._db.commit()
+        return len(records)
+
+    def load(self, coin_ids: List[str], vs_currency: str = "usd", days: int = 365) -> pd.DataFrame:
+        """ Historique des `days` derniers jours, même format que get_ohlc_dataframe """
+        since = int(time.time() * 1000) - days * _MS_PER_DAY
+        placeholders = ",".join("?" * len(coin_ids))
+        with self._lock:
+            df = pd.read_sql_query(
+                f"SELECT coin_id, ts, open, high, low, close FROM ohlc "
+                f"WHERE vs_currency = ? AND resolution = ? AND ts >= ? AND coin_id IN ({placeholders}) "
+                f"ORDER BY coin_id, ts",
+                self._db, params=[vs_currency, resolution_for(days), since, *coin_ids])
+        df.insert(1, "timestamp", pd.to_datetime(df.pop("ts").to_numpy(dtype=np.int64), unit="ms"))
+        df["coin_id"] = pd.Categorical(df["coin_id"], categories=list(coin_ids))
+        return df.sort_values(["coin_id", "timestamp"], ignore_index=True)
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,141 @@
+import json
+import os
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+OHLC_COLUMNS = ["open", "high", "low", "close"]
+
+
+class OhlcMmapStore:
+    """
+    Stockage binaire colonne des OHLC, lu par memory-mapping.
+
+    Un dossier par store :
+        index.json              {coin_id: {"n": nb bougies, "first": ts_ms, "last": ts_ms}}
+        <coin_id>.ts.i8         timestamps int64 (ms), triés, contigus
+        <coin_id>.ohlc.f8       float64 (n × 4 : open, high, low, close), contigus
+
+    Rien n'est chargé à l'ouverture : les fichiers sont mappés en mémoire à la
+    demande, et range() fait une recherche dichotomique (np.searchsorted) sur
+    les timestamps puis renvoie des VUES sur le mapping (zéro copie).
+    Coût d'une requête : O(log n), indépendant de la taille de l'historique.
+
+    Exemple :
+        store = OhlcMmapStore.from_json("profs/crypto_data.json", "crypto_store")
+        ts, ohlc = store.range("bitcoin", "2025-03-01", "2025-03-31")
+        close = ohlc[:, 3]
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._index_path = os.path.join(directory, "index.json")
+        self.index = {}
+        if os.path.exists(self._index_path):
+            with open(self._index_path, encoding="utf-8") as f:
+                self.index = json.load(f)
+        self._maps = {}                     # coin_id → (timestamps memmap, ohlc memmap)
+
+    def _paths(self, coin_id: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, coin_id)
+        return base + ".ts.i8", base + ".ohlc.f8"
+
+    def coins(self):
+        return list(self.index)
+
+    def write(self, coin_id: str, timestamps, ohlc) -> None:
+        """
+        (Ré)écrit l'historique d'un coin. timestamps : int64 ms ou datetime64 ;
+        ohlc : tableau (n × 4). Les données sont triées et dédoublonnées par timestamp.
+        """
+        ts = np.asarray(timestamps)
+        if np.issubdtype(ts.dtype, np.datetime64):
+            ts = ts.astype("datetime64[ms]").astype("int64")
+        ts = ts.astype("int64")
+        values = np.asarray(ohlc, dtype="float64").reshape(-1, 4)
+
+        # Tri + dernier point conservé pour un timestamp dupliqué
+        order = np.argsort(ts, kind="stable")
+        ts, values = ts[order], values[order]
+        keep = np.append(ts[1:] != ts[:-1], True) if len(ts) else np.zeros(0, dtype=bool)
+        ts, values = ts[keep], np.ascontiguousarray(values[keep])
+
+        # Fichiers temporaires puis os.replace : les memmaps (et vues) déjà ouverts
+        # gardent l'ancien fichier (inode) intact au lieu d'être tronqués sous eux
+        self._maps.pop(coin_id, None)
+        ts_path, ohlc_path = self._paths(coin_id)
+        ts.tofile(ts_path + ".tmp")
+        values.tofile(ohlc_path + ".tmp")
+        os.replace(ts_path + ".tmp", ts_path)
+        os.replace(ohlc_path + ".tmp", ohlc_path)
+        self.index[coin_id] = {"n": int(len(ts)),
+                               "first": int(ts[0]) if len(ts) else None,
+                               "last": int(ts[-1]) if len(ts) else None}
+        self._save_index()
+
+    def append(self, coin_id: str, timestamps, ohlc) -> None:
+        """ Ajoute des bougies à l'historique existant (réécrit les fichiers du coin) """
+        if coin_id in self.index and self.index[coin_id]["n"]:
+            old_ts, old_ohlc = self.arrays(coin_id)
+            ts = np.asarray(timestamps)
+            if np.issubdtype(ts.dtype, np.datetime64):
+                ts = ts.astype("datetime64[ms]").astype("int64")
+            timestamps = np.concatenate([old_ts, ts.astype("int64")])
+            ohlc = np.concatenate([old_ohlc, np.asarray(ohlc, dtype="float64").reshape(-1, 4)])
+        self.write(coin_id, timestamps, ohlc)
+
+    def _save_index(self) -> None:
+        tmp = self._index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f)
+        os.replace(tmp, self._index_path)
+
+    def arrays(self, coin_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """ (timestamps int64, ohlc n × 4) mappés en lecture seule """
+        if coin_id not in self._maps:
+            n = self.index[coin_id]["n"]
+            ts_path, ohlc_path = self._paths(coin_id)
+            if n == 0:
+                self._maps[coin_id] = (np.empty(0, dtype="int64"), np.empty((0, 4)))
+            else:
+                self._maps[coin_id] = (np.memmap(ts_path, dtype="int64", mode="r", shape=(n,)),
+                                       np.memmap(ohlc_path, dtype="float64", mode="r", shape=(n, 4)))
+        return self._maps[coin_id]
+
+    def range(self, coin_id: str, start=None, end=None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bougies avec start <= timestamp <= end (dates str, Timestamp ou ms ;
+        None = pas de borne), en vues sur le memmap.
+        """
+        ts, ohlc = self.arrays(coin_id)
+        lo = 0 if start is None else int(np.searchsorted(ts, _to_ms(start), side="left"))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, _to_ms(end), side="right"))
+        return ts[lo:hi], ohlc[lo:hi]
+
+    def to_frame(self, coin_id: str, start=None, end=None) -> pd.DataFrame:
+        """ Même plage en DataFrame (copie) indexé par timestamp """
+        ts, ohlc = self.range(coin_id, start, end)
+        return pd.DataFrame(np.asarray(ohlc), columns=OHLC_COLUMNS,
+                            index=pd.to_datetime(np.asarray(ts), unit="ms").rename("timestamp"))
+
+    @classmethod
+    def from_json(cls, json_path: str, directory: str) -> "OhlcMmapStore":
+        """
+        Conversion en une fois du format JSON historique (profs/crypto_data.json,
+        sortie de get_ohlc_data_date) : {coin_id: {'YYYY-MM-DD': [o, h, l, c]}}
+        """
+        with open(json_path, encoding="utf-8") as f:
+            data: Dict[str, Dict[str, list]] = json.load(f)
+        store = cls(directory)
+        for coin_id, by_date in data.items():
+            ts = pd.to_datetime(list(by_date.keys())).to_numpy(dtype="datetime64[ms]")
+            store.write(coin_id, ts, list(by_date.values()))
+        return store
+
+
+def _to_ms(value) -> int:
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int(pd.Timestamp(value).value // 1_000_000)
@@ -0,0 +1,123 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+# Limites par minute des offres CoinGecko (marge de sécurité incluse)
+PLANS = {
+    "public": 10,
+    "demo": 30,
+    "pro": 500,
+}
+
+
+class RateLimiter:
+    """
+    Limiteur de débit « token bucket » partagé entre threads, et utilisable
+    aussi bien par MyGeckoApi (acquire) que par AsyncGeckoApi (acquire_async).
+
+    - le seau se remplit de `rate_per_minute` jetons par minute, jusqu'à `burst`
+    - chaque requête consomme un jeton ; s'il n'y en a pas, on attend juste
+      le temps nécessaire (réservation → pas d'attente active)
+    - sur un 429, le seau est bloqué pendant la durée de l'en-tête Retry-After,
+      ou à défaut pendant un backoff exponentiel avec jitter
+    - metrics() : nb de requêtes, nb de 429, temps total passé à attendre
+
+    Exemple :
+        limiter = RateLimiter.from_plan("demo")
+        api = MyGeckoApi(api_key=my_api_key, rate_limiter=limiter)
+        async_api = AsyncGeckoApi(api_key=my_api_key, rate_limiter=limiter)   # même quota
+    """
+
+    def __init__(self, rate_per_minute: float, burst: Optional[int] = None, max_retries: int = 5,
+                 base_backoff: float = 1.0, max_backoff: float = 60.0):
+        self.rate = rate_per_minute / 60.0           # jetons par seconde
+        self.burst = burst if burst is not None else max(1, int(rate_per_minute // 6))
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "throttled_seconds": 0.0, "rate_limited_429": 0}
+
+    @classmethod
+    def from_plan(cls, plan: str = "demo", **kwargs) -> "RateLimiter":
+        """ Limiteur configuré pour une offre CoinGecko ('public', 'demo', 'pro') """
+        if plan not in PLANS:
+            raise ValueError(f"Plan inconnu '{plan}' (attendu : {', '.join(PLANS)})")
+        return cls(PLANS[plan], **kwargs)
+
+    def _refill(self, now: float) -> None:
+        """ Ajoute les jetons gagnés depuis _last (rien tant qu'un blocage 429 est en cours) """
+        if now > self._last:
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+
+    def _reserve(self) -> float:
+        """ Consomme un jeton et retourne le délai d'attente avant de l'utiliser """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            # Fin du blocage éventuel (_last > now) PUIS le temps de rembourser la dette
+            wait = max(0.0, self._last - now) + (-self._tokens / self.rate if self._tokens < 0 else 0.0)
+            self._stats["requests"] += 1
+            self._stats["throttled_seconds"] += wait
+            return wait
+
+    def acquire(self) -> None:
+        """ Version synchrone : bloque le thread le temps nécessaire """
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """ Version asyncio : n'occupe pas la boucle pendant l'attente """
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def backoff(self, attempt: int) -> float:
+        """ Backoff exponentiel « full jitter » : aléatoire dans [0, base × 2^attempt] """
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** attempt))
+
+    def on_rate_limited(self, retry_after: Optional[str], attempt: int) -> float:
+        """
+        À appeler sur une réponse 429 : bloque le seau pour TOUS les appelants
+        pendant Retry-After (ou le backoff) et retourne ce délai.
+        """
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = self.backoff(attempt)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Le seau ne se remplit plus avant la fin du blocage : à sa levée, un seul
+            # jeton, puis les appelants en file repartent au rythme normal (pas de rafale)
+            self._last = max(self._last, now + delay)
+            self._tokens = 1.0 if self._tokens >= 0 else self._tokens    # dette des réservations en cours conservée
+            self._stats["rate_limited_429"] += 1
+        return delay
+
+    def metrics(self) -> Dict:
+        """ Copie des compteurs (requêtes, 429 reçus, secondes d'attente) """
+        with self._lock:
+            return dict(self._stats)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """ En-tête Retry-After (secondes ou date HTTP) → secondes, ou None """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
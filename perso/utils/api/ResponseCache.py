@@ -0,0 +1,118 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from fnmatch import fnmatch
+from typing import Any, Dict, Optional, Tuple
+
+# Durées de vie (secondes) par endpoint : prix de marché courts, OHLC plus longs
+DEFAULT_TTLS = {
+    "coins/markets": 60,
+    "coins/*/ohlc": 3600,
+}
+
+
+class ResponseCache:
+    """
+    Cache des réponses CoinGecko à deux niveaux :
+    - mémoire : LRU de `max_memory_entries` réponses (accès en microsecondes)
+    - disque  : base SQLite (`path`), survit aux redémarrages ; None = mémoire seule
+
+    Chaque entrée a une date d'expiration (TTL par endpoint, motifs fnmatch)
+    puis une période « stale » de `stale_ttl` secondes pendant laquelle elle
+    est encore servie, le temps qu'un rafraîchissement en arrière-plan la
+    remplace (stale-while-revalidate).
+
+    La clé = endpoint + paramètres normalisés, SANS la clé API : deux
+    utilisateurs qui demandent la même chose partagent l'entrée.
+    Les objets renvoyés sont partagés : ne pas les modifier en place.
+
+    Exemple :
+        cache = ResponseCache("gecko_cache.sqlite", ttls={"coins/markets": 30})
+        api = MyGeckoApi(api_key=my_api_key, cache=cache)
+    """
+
+    def __init__(self, path: Optional[str] = None, ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = 300, stale_ttl: float = 300, max_memory_entries: int = 1024):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.max_memory_entries = max_memory_entries
+        self._memory = OrderedDict()        # clé → (expire_à, périmé_à, valeur)
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS responses ("
+                             "key TEXT PRIMARY KEY, value TEXT, expires_at REAL, stale_until REAL)")
+            self._db.commit()
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None) -> str:
+        """
+        endpoint + paramètres triés ; clé API (x_cg_*) exclue, listes → 'a,b,c'.
+        'coin_id' est aussi exclu : l'identifiant est déjà dans l'endpoint
+        (coins/{id}/ohlc) et la liste complète n'influe pas sur la réponse.
+        """
+        normalized = {}
+        for k, v in (params or {}).items():
+            if k.startswith("x_cg_") or k == "coin_id":
+                continue
+            if isinstance(v, (list, tuple)):
+                v = ",".join(map(str, v))
+            normalized[k] = str(v).lower() if isinstance(v, bool) else str(v)
+        return endpoint + "?" + json.dumps(normalized, sort_keys=True)
+
+    def ttl_for(self, endpoint: str) -> float:
+        for pattern, ttl in self.ttls.items():
+            if fnmatch(endpoint, pattern):
+                return ttl
+        return self.default_ttl
+
+    def get(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """ (valeur, encore_fraîche) ou None si absente / trop ancienne """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute("SELECT expires_at, stale_until, value FROM responses WHERE key = ?",
+                                       (key,)).fetchone()
+                if row is not None:
+                    entry = (row[0], row[1], json.loads(row[2]))
+                    self._remember(key, entry)
+        if entry is None or now >= entry[1]:
+            return None
+        return entry[2], now < entry[0]
+
+    def set(self, key: str, endpoint: str, value: Any) -> None:
+        now = time.time()
+        expires_at = now + self.ttl_for(endpoint)
+        entry = (expires_at, expires_at + self.stale_ttl, value)
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                                 (key, json.dumps(value), entry[0], entry[1]))
+                self._db.commit()
+
+    def _remember(self, key: str, entry: Tuple) -> None:
+        """ Ajout au niveau mémoire avec éviction LRU (appelé sous verrou) """
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def purge(self) -> None:
+        """ Supprime du disque les entrées au-delà de leur période stale """
+        with self._lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses WHERE stale_until < ?", (time.time(),))
+                self._db.commit()
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
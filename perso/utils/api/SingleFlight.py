@@ -0,0 +1,70 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict
+
+
+class _Call:
+    """ Appel en cours partagé : résultat ou exception, et un Event de fin """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Regroupement des appels identiques simultanés (« single flight »), version threads.
+
+    Si plusieurs threads appellent do(key, fn) avec la même clé pendant qu'un
+    appel est en cours, un seul exécute fn() ; les autres attendent et
+    reçoivent le même résultat (ou la même exception). Dès que l'appel est
+    terminé, la clé est libérée : l'appel suivant repart sur le réseau.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """
+    Même principe pour asyncio : les coroutines qui demandent la même clé
+    attendent la même tâche. asyncio.shield évite qu'un appelant annulé
+    n'annule la requête pour tous les autres.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await asyncio.shield(task)
@@ -0,0 +1,163 @@
+"""
+Banc d'essai hors ligne de MyGeckoApi / AsyncGeckoApi contre FakeGeckoServer.
+
+Mesure, pour plusieurs configurations de client, le débit (requêtes/s), les
+latences p50 / p99 par requête et la durée totale d'une collecte OHLC.
+
+Lancement (depuis la racine du dépôt) :
+    python -m perso.utils.api.benchmark_gecko --latency 0.05 --rounds 5
+    python -m perso.utils.api.benchmark_gecko --rate-per-minute 600 --error-rate 0.02
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from perso.utils.api.FakeGeckoServer import FakeGeckoServer
+from perso.utils.api.MyGeckoApi import MyGeckoApi
+from perso.utils.api.RateLimiter import RateLimiter
+
+
+def _instrument(api):
+    """ Enregistre la latence de chaque appel réseau (_fetch) du client """
+    latencies, errors = [], [0]
+    fetch = api._fetch
+
+    if asyncio.iscoroutinefunction(fetch):
+        async def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await fetch(*args, **kwargs)
+            except Exception:
+                errors[0] += 1
+                raise
+            finally:
+                latencies.append(time.perf_counter() - start)
+    else:
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fetch(*args, **kwargs)
+            except Exception:
+                errors[0] += 1
+                raise
+            finally:
+                latencies.append(time.perf_counter() - start)
+
+    api._fetch = timed
+    return latencies, errors
+
+
+def _result(name, latencies, errors, duration, server):
+    lat = np.asarray(latencies) * 1000
+    return {
+        "scenario": name,
+        "requetes": len(lat),
+        "erreurs": errors[0],
+        "429_serveur": server.stats["429"],
+        "duree_s": round(duration, 3),
+        "req_par_s": round(len(lat) / duration, 1) if duration else None,
+        "p50_ms": round(float(np.percentile(lat, 50)), 1) if len(lat) else None,
+        "p99_ms": round(float(np.percentile(lat, 99)), 1) if len(lat) else None,
+    }
+
+
+def _collect(api, coin_ids, rounds, workers):
+    """ Collecte OHLC de tous les coins, `rounds` fois, sur `workers` threads """
+    payload = {"vs_currency": "usd", "days": 30}
+
+    def one(coin_id):
+        try:
+            api._make_request(f"coins/{coin_id}/ohlc", payload)
+        except Exception:
+            pass                                # déjà compté par _instrument
+
+    jobs = coin_ids * rounds
+    if workers <= 1:
+        for coin_id in jobs:
+            one(coin_id)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(one, jobs))
+
+
+def bench_sync(name, server, coin_ids, rounds, workers=1, **api_kwargs):
+    server.reset()                              # quota rate_per_minute propre à chaque scénario
+    api = MyGeckoApi(root_url=server.root_url, **api_kwargs)
+    latencies, errors = _instrument(api)
+    start = time.perf_counter()
+    _collect(api, coin_ids, rounds, workers)
+    duration = time.perf_counter() - start
+    api.close()
+    return _result(name, latencies, errors, duration, server)
+
+
+def bench_async(name, server, coin_ids, rounds, max_in_flight, **api_kwargs):
+    from perso.utils.api.AsyncGeckoApi import AsyncGeckoApi
+
+    server.reset()
+    api = AsyncGeckoApi(root_url=server.root_url, max_in_flight=max_in_flight, **api_kwargs)
+    latencies, errors = _instrument(api)
+    payload = {"vs_currency": "usd", "days": 30}
+
+    async def run():
+        async def one(coin_id):
+            try:
+                await api._make_request(f"coins/{coin_id}/ohlc", payload)
+            except Exception:
+                pass
+        await asyncio.gather(*(one(c) for c in coin_ids * rounds))
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    duration = time.perf_counter() - start
+    api.close()
+    return _result(name, latencies, errors, duration, server)
+
+
+def run_benchmark(latency=0.02, jitter=0.0, rate_per_minute=None, error_rate=0.0, rounds=3,
+                  threads=16, max_in_flight=16) -> pd.DataFrame:
+    """
+    Lance tous les scénarios sur un même serveur local (fenêtre de débit et
+    compteurs remis à zéro avant chacun) ; retourne le tableau des mesures
+    """
+    with FakeGeckoServer(latency=latency, jitter=jitter, rate_per_minute=rate_per_minute,
+                         error_rate=error_rate, seed=0) as server:
+        coin_ids = [m["id"] for m in server._markets]
+        limiter_rate = rate_per_minute or 6000
+        results = [
+            bench_sync("sync séquentiel", server, coin_ids, rounds, coalesce=False),
+            bench_sync(f"sync {threads} threads", server, coin_ids, rounds, workers=threads,
+                       pool_size=threads, coalesce=False),
+            bench_sync(f"sync {threads} threads + coalescing", server, coin_ids, rounds,
+                       workers=threads, pool_size=threads),
+            bench_sync(f"sync {threads} threads + rate limiter", server, coin_ids, rounds,
+                       workers=threads, pool_size=threads, coalesce=False,
+                       rate_limiter=RateLimiter(limiter_rate, burst=threads)),
+        ]
+        try:
+            results.append(bench_async(f"async {max_in_flight} en vol", server, coin_ids, rounds,
+                                       max_in_flight, coalesce=False))
+        except ImportError:
+            print("tornado non installé → scénario async ignoré")
+
+    df = pd.DataFrame(results)
+    print(df.to_string(index=False))
+    return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--rate-per-minute", type=int, default=None)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--max-in-flight", type=int, default=16)
+    args = parser.parse_args()
+    run_benchmark(args.latency, args.jitter, args.rate_per_minute, args.error_rate,
+                  args.rounds, args.threads, args.max_in_flight)
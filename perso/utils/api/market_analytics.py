@@ -0,0 +1,145 @@
+"""
+Indicateurs de marché calculés pour TOUS les coins à la fois, sur la matrice
+(coins × temps) des prix OHLC — aucune boucle Python sur les coins.
+
+Exemple :
+    df = api.get_ohlc_dataframe({"coin_id": coin_ids, "days": 365, "vs_currency": "usd"})
+    coins, timestamps, close = stack_ohlc(df, "close")
+    rets = returns(close)
+    vol = rolling_volatility(rets, window=7)
+    screen(df).sort_values("max_drawdown")
+"""
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def stack_ohlc(df: pd.DataFrame, field: str = "close") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    DataFrame long (coin_id, timestamp, open, high, low, close — cf. ohlc_to_frame)
+    → (coins, timestamps, matrice coins × temps). Trous = NaN.
+    """
+    wide = df.pivot_table(index="coin_id", columns="timestamp", values=field, aggfunc="last", observed=True)
+    return wide.index.to_numpy(), wide.columns.to_numpy(), wide.to_numpy(dtype="float64")
+
+
+def returns(prices: np.ndarray, log: bool = False) -> np.ndarray:
+    """ Rendements par période, même forme que prices (1re colonne = NaN) """
+    out = np.full_like(prices, np.nan, dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if log:
+            out[:, 1:] = np.diff(np.log(prices), axis=1)
+        else:
+            out[:, 1:] = prices[:, 1:] / prices[:, :-1] - 1
+    return out
+
+
+def _rolling_sums(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sommes glissantes (et nb de valeurs non-NaN) sur l'axe du temps par
+    différence de sommes cumulées : O(coins × temps) quelle que soit la fenêtre.
+    """
+    valid = ~np.isnan(values)
+    csum = np.cumsum(np.where(valid, values, 0.0), axis=1)
+    ccount = np.cumsum(valid, axis=1)
+    pad = np.zeros((values.shape[0], 1))
+    csum = np.concatenate([pad, csum], axis=1)
+    ccount = np.concatenate([pad, ccount], axis=1)
+    sums = csum[:, window:] - csum[:, :-window]
+    counts = ccount[:, window:] - ccount[:, :-window]
+    return sums, counts
+
+
+def rolling_mean(values: np.ndarray, window: int, min_periods: int = None) -> np.ndarray:
+    """ Moyenne glissante (NaN ignorés), alignée à droite, même forme que values """
+    min_periods = min_periods or window
+    sums, counts = _rolling_sums(values, window)
+    out = np.full(values.shape, np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out[:, window - 1:] = np.where(counts >= min_periods, sums / counts, np.nan)
+    return out
+
+
+def rolling_volatility(rets: np.ndarray, window: int, periods_per_year: float = None,
+                       min_periods: int = None) -> np.ndarray:
+    """
+    Écart-type glissant des rendements (ddof=1) via sommes cumulées de r et r².
+    periods_per_year → volatilité annualisée (× sqrt(periods_per_year)).
+    """
+    min_periods = max(min_periods or window, 2)
+    sums, counts = _rolling_sums(rets, window)
+    sq_sums, _ = _rolling_sums(rets ** 2, window)
+    out = np.full(rets.shape, np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = (sq_sums - sums ** 2 / counts) / (counts - 1)
+        std = np.sqrt(np.clip(var, 0, None))     # clip : erreurs d'arrondi négatives
+        out[:, window - 1:] = np.where(counts >= min_periods, std, np.nan)
+    if periods_per_year:
+        out *= np.sqrt(periods_per_year)
+    return out
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """ Maximum glissant (vues sliding_window_view, sans copie des fenêtres) """
+    out = np.full(values.shape, np.nan)
+    if values.shape[1] >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=1)
+        with np.errstate(invalid="ignore"):
+            out[:, window - 1:] = np.nanmax(windows, axis=2)
+    return out
+
+
+def drawdowns(prices: np.ndarray) -> np.ndarray:
+    """ Baisse relative depuis le plus haut historique (≤ 0), pour chaque point """
+    filled = np.where(np.isnan(prices), -np.inf, prices)
+    peaks = np.maximum.accumulate(filled, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(np.isnan(prices), np.nan, prices / peaks - 1)
+
+
+def correlation_matrix(rets: np.ndarray, min_periods: int = 3) -> np.ndarray:
+    """
+    Corrélations de Pearson coins × coins, calculées en produits matriciels
+    sur les périodes communes à chaque paire (NaN pris en compte par masques).
+    """
+    valid = (~np.isnan(rets)).astype("float64")
+    x = np.where(np.isnan(rets), 0.0, rets)
+    n = valid @ valid.T                              # nb de périodes communes par paire
+    sx = x @ valid.T                                 # Σ x_i sur les périodes communes à (i, j)
+    sxx = (x ** 2) @ valid.T
+    sxy = x @ x.T
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sxy - sx * sx.T / n
+        var_i = sxx - sx ** 2 / n
+        corr = cov / np.sqrt(var_i * var_i.T)
+    corr[n < min_periods] = np.nan
+    return corr
+
+
+def screen(df: pd.DataFrame, vol_window: int = 7, periods_per_year: float = None) -> pd.DataFrame:
+    """
+    Tableau de synthèse par coin : rendement total, volatilité (sur toute la
+    période et sur les `vol_window` dernières), drawdown max et actuel.
+    """
+    coins, _, close = stack_ohlc(df, "close")
+    rets = returns(close)
+    dd = drawdowns(close)
+    vol = rolling_volatility(rets, vol_window, periods_per_year)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        first_idx = np.argmax(~np.isnan(close), axis=1)
+        last_idx = close.shape[1] - 1 - np.argmax(~np.isnan(close[:, ::-1]), axis=1)
+        rows = np.arange(len(coins))
+        total_return = close[rows, last_idx] / close[rows, first_idx] - 1
+        full_vol = np.nanstd(rets, axis=1, ddof=1)
+        if periods_per_year:
+            full_vol *= np.sqrt(periods_per_year)
+
+    return pd.DataFrame({
+        "total_return": total_return,
+        "volatility": full_vol,
+        f"volatility_last_{vol_window}": vol[rows, last_idx],
+        "max_drawdown": np.nanmin(dd, axis=1),
+        "current_drawdown": dd[rows, last_idx],
+    }, index=pd.Index(coins, name="coin_id"))
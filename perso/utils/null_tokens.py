@@ -0,0 +1,129 @@
+"""
+Dictionnaire configurable des « faux vides » : chaînes qui signifient en
+réalité « valeur manquante » ('', 'None', 'N/A', '-', '?', 'N.C.', 'inconnu'...).
+
+Partagé par rapport_data_complet (profs/EDA/data_audit/utils.py), DataAuditor
+et DataCleaner (perso/bidouilles) pour que tout le monde compte / remplace
+les mêmes tokens.
+
+Exemple :
+    tokens = NullTokens(locales=['fr', 'en'], extra={'pas de réponse': 'Autre token'})
+    df = read_csv_with_null_tokens("export.csv", tokens)       # remplacés au chargement
+    tokens.count(df['ville'])                                   # comptage par catégorie
+"""
+import numpy as np
+import pandas as pd
+
+# Catégories = colonnes du rapport de rapport_data_complet
+VIDE = 'Vide'
+NONE = 'None'
+NA = 'na/n/a/null'
+AUTRE = 'Autre token'
+
+# Tokens par langue, déjà normalisés (strip + minuscules).
+# Volontairement sans 'nc', 'nr', 'aucun'... qui sont souvent de vraies valeurs.
+NULL_TOKENS = {
+    'common': {
+        '': VIDE,
+        'none': NONE,
+        'na': NA, 'n/a': NA, 'n.a.': NA, 'null': NA, 'nan': NA, '#n/a': NA,
+        '-': AUTRE, '--': AUTRE, '?': AUTRE, '.': AUTRE,
+    },
+    'fr': {
+        'n.c.': AUTRE, 'n.r.': AUTRE,
+        'inconnu': AUTRE, 'inconnue': AUTRE, 'sans objet': AUTRE, 's.o.': AUTRE,
+        'non renseigné': AUTRE, 'non renseigne': AUTRE, 'néant': AUTRE, 'neant': AUTRE,
+    },
+    'en': {
+        'unknown': AUTRE, 'not available': AUTRE, 'not applicable': AUTRE,
+        'missing': AUTRE, 'undefined': AUTRE, 'nil': AUTRE,
+    },
+}
+
+
+def normaliser_token(valeur) -> str:
+    """ Forme canonique d'une chaîne pour la recherche dans la table """
+    return str(valeur).strip().lower()
+
+
+class NullTokens:
+    """
+    Table de correspondance token normalisé → catégorie, compilée une fois
+    en dict (lookup par hash en O(1), quel que soit le nombre de tokens).
+
+    Les recherches se font sur les valeurs UNIQUES d'une colonne (factorize),
+    puis sont redistribuées sur toutes les lignes par les codes entiers.
+    """
+
+    def __init__(self, locales=('fr', 'en'), extra: dict = None):
+        self.locales = ['common'] + [loc for loc in locales if loc != 'common']
+        self.table = {}
+        for loc in self.locales:
+            self.table.update(NULL_TOKENS[loc])
+        for token, categorie in (extra or {}).items():
+            self.table[normaliser_token(token)] = categorie
+        self.categories = list(dict.fromkeys(self.table.values()))
+
+    def _lookup_uniques(self, serie: pd.Series):
+        """ (codes, catégorie de chaque valeur unique ou NaN) """
+        codes, uniques = pd.factorize(serie, use_na_sentinel=True)
+        if len(uniques) == 0 or not (pd.api.types.is_object_dtype(serie) or pd.api.types.is_string_dtype(serie)):
+            return codes, pd.Index([np.nan] * len(uniques))
+        return codes, pd.Index(uniques).astype(str).str.strip().str.lower().map(self.table)
+
+    def count(self, serie: pd.Series) -> dict:
+        """ {'NaN': n, <catégorie>: n, ...} en un passage sur la colonne """
+        comptes = dict.fromkeys(['NaN'] + self.categories, 0)
+        codes, categories = self._lookup_uniques(serie)
+        comptes['NaN'] = int((codes == -1).sum())
+        suspects = np.flatnonzero(categories.notna())
+        if len(suspects) > 0:
+            occurrences = np.bincount(codes[codes >= 0], minlength=len(categories))
+            for idx in suspects:
+                comptes[categories[idx]] += int(occurrences[idx])
+        return comptes
+
+    def mask(self, serie: pd.Series) -> np.ndarray:
+        """ Masque booléen des lignes contenant un token (hors vrais NaN) """
+        codes, categories = self._lookup_uniques(serie)
+        est_token = np.append(np.asarray(categories.notna()), False)  # code -1 → False
+        return est_token[codes]
+
+    def replace(self, serie: pd.Series) -> pd.Series:
+        """ Remplace les tokens par NaN """
+        m = self.mask(serie)
+        return serie.mask(m) if m.any() else serie
+
+    def na_values(self) -> list:
+        """
+        Variantes de casse de chaque token pour pd.read_csv(na_values=...) :
+        le parseur C de pandas les remplace par NaN pendant la lecture,
+        sans aucun parcours supplémentaire des colonnes.
+        ('' est déjà traité par pandas ; les espaces autour ne le sont pas,
+        d'où replace()/count() pour les cas restants.)
+        """
+        variantes = set()
+        for token in self.table:
+            if token:
+                variantes.update({token, token.upper(), token.capitalize(), token.title()})
+        return sorted(variantes)
+
+
+def read_csv_with_null_tokens(path, null_tokens: NullTokens = None, **kwargs) -> pd.DataFrame:
+    """ pd.read_csv avec les tokens de null_tokens convertis en NaN au chargement """
+    null_tokens = null_tokens or NullTokens()
+    na_values = kwargs.pop('na_values', None) or []
+    if isinstance(na_values, str):
+        na_values = [na_values]
+    return pd.read_csv(path, na_values=list(na_values) + null_tokens.na_values(), **kwargs)
+
+
+if __name__ == '__main__':
+    # Vérification rapide : python -m perso.utils.null_tokens
+    tokens = NullTokens()
+    serie = pd.Series(['Paris', ' N/A ', None, '', 'inconnu', 'Lyon', 'none'])
+    assert tokens.count(serie) == {'NaN': 1, 'Vide': 1, 'None': 1, 'na/n/a/null': 1, 'Autre token': 1}
+    assert tokens.mask(serie).tolist() == [False, True, False, True, True, False, True]
+    assert tokens.replace(serie).isna().tolist() == [False, True, True, True, True, False, True]
+    assert not tokens.mask(pd.Series([1.0, np.nan, 3.0])).any()
+    print('null_tokens OK')
@@ -1,9 +1,14 @@
 #utils
+import pandas as pd
 
-def rapport_data_complet(df, colonnes=None, total_lignes=None):
+from perso.utils.null_tokens import NullTokens
+
+
+def calcul_rapport_suspects(df, colonnes=None, total_lignes=None, null_tokens=None):
     """
-    Rapport complet des valeurs manquantes + suspectes
-    Utilise un DataFrame pandas pour un affichage plus propre
+    Calcule le tableau du rapport (sans affichage) : une ligne par colonne,
+    avec NaN, une colonne par catégorie de token suspect (voir NullTokens),
+    Total suspect, % et Commentaire.
     """
     if total_lignes is None:
         total_lignes = len(df)
@@ -11,22 +16,16 @@ def rapport_data_complet(df, colonnes=None, total_lignes=None):
     if colonnes is None:
         colonnes = df.columns.tolist()
 
-    data = []
-    for col in colonnes:
-        if col not in df.columns:
-            continue
-
-        na_count = df[col].isna().sum()
+    null_tokens = null_tokens or NullTokens()
+    comptes = {col: null_tokens.count(df[col]) for col in colonnes if col in df.columns}
+    return _construire_rapport(comptes, total_lignes, null_tokens.categories)
 
-        # Chaînes problématiques (seulement sur colonnes texte)
-        vide = none_str = na_variants = 0
-        if df[col].dtype in ['object', 'string']:
-            str_col = df[col].astype(str).str.strip().str.lower()
-            vide       = (str_col == '').sum()
-            none_str   = (str_col == 'none').sum()
-            na_variants = str_col.isin(['na', 'n/a', 'null']).sum()
 
-        total_suspect = na_count + vide + none_str + na_variants
+def _construire_rapport(comptes, total_lignes, categories):
+    """ Transforme {colonne: compteurs} en DataFrame de rapport trié """
+    data = []
+    for col, c in comptes.items():
+        total_suspect = sum(c.values())
         pct = round((total_suspect / total_lignes) * 100, 1) if total_lignes > 0 else 0.0
 
         # Commentaire court relatif au pct de manques/erronés
@@ -45,21 +44,74 @@ def rapport_data_complet(df, colonnes=None, total_lignes=None):
 
         data.append({
             'Colonne': col,
-            'NaN': na_count,
-            'Vide': vide,
-            'None': none_str,
-            'na/n/a/null': na_variants,
+            **c,
             'Total suspect': total_suspect,
             '%': pct,
             'Commentaire': commentaire
         })
 
     # Création du DataFrame
-    rapport_df = pd.DataFrame(data)
+    rapport_df = pd.DataFrame(data, columns=['Colonne', 'NaN', *categories,
+                                             'Total suspect', '%', 'Commentaire'])
 
     # Tri : parfait d'abord, puis par % croissant
-    rapport_df = rapport_df.sort_values(by=['Total suspect', '%'])
+    return rapport_df.sort_values(by=['Total suspect', '%'])
+
+
+def rapport_data_complet(df, colonnes=None, total_lignes=None, afficher=False, null_tokens=None):
+    """
+    Rapport complet des valeurs manquantes + suspectes
+    Retourne le rapport sous forme de DataFrame ; afficher=True pour
+    l'affichage détaillé (tableau + recommandations).
+    null_tokens : NullTokens personnalisé (langues, tokens supplémentaires)
+    """
+    if total_lignes is None:
+        total_lignes = len(df)
+    rapport_df = calcul_rapport_suspects(df, colonnes, total_lignes, null_tokens)
+    if afficher:
+        afficher_rapport(rapport_df, total_lignes)
+    return rapport_df
+
 
+def rapport_data_complet_csv(chemin, colonnes=None, chunksize=200_000, afficher=False,
+                             null_tokens=None, **read_csv_kwargs):
+    """
+    Même rapport que rapport_data_complet, mais en lisant le CSV par morceaux :
+    seules les `colonnes` demandées sont lues (usecols) et les compteurs
+    NaN / Vide / None / na... sont cumulés chunk par chunk.
+    Mémoire bornée à un chunk → utilisable sur des exports de plusieurs Go.
+    Les options de lecture (sep, encoding, dtype...) passent par read_csv_kwargs.
+    """
+    null_tokens = null_tokens or NullTokens()
+    comptes = {}
+    total_lignes = 0
+
+    # Comme rapport_data_complet : les colonnes absentes du fichier sont ignorées
+    # (usecols lèverait une ValueError)
+    usecols = None
+    if colonnes is not None:
+        entete = pd.read_csv(chemin, nrows=0, **read_csv_kwargs).columns
+        usecols = [col for col in colonnes if col in entete]
+
+    for chunk in pd.read_csv(chemin, usecols=usecols, chunksize=chunksize, **read_csv_kwargs):
+        total_lignes += len(chunk)
+        for col in chunk.columns:
+            cumul = comptes.setdefault(col, dict.fromkeys(['NaN'] + null_tokens.categories, 0))
+            for categorie, n in null_tokens.count(chunk[col]).items():
+                cumul[categorie] += n
+
+    # Ordre des colonnes demandé par l'appelant (read_csv suit l'ordre du fichier)
+    if colonnes is not None:
+        comptes = {col: comptes[col] for col in colonnes if col in comptes}
+
+    rapport_df = _construire_rapport(comptes, total_lignes, null_tokens.categories)
+    if afficher:
+        afficher_rapport(rapport_df, total_lignes)
+    return rapport_df
+
+
+def afficher_rapport(rapport_df, total_lignes):
+    """ Affichage du rapport calculé par calcul_rapport_suspects """
     # ────────────────────────────────────────────────
     # Affichage
     # ────────────────────────────────────────────────
@@ -80,7 +132,8 @@ def rapport_data_complet(df, colonnes=None, total_lignes=None):
 
     # Note + recommandations génériques
     print("\nNote : les colonnes numériques convertissent souvent '' ou 'None' en NaN lors du chargement.")
-    print("Pour les colonnes texte, les chaînes vides et 'na'/'None' sont plus fréquentes.\n")
+    print("Pour les colonnes texte, les chaînes vides et 'na'/'None' sont plus fréquentes.")
+    print("Astuce : read_csv_with_null_tokens() (perso/utils/null_tokens.py) les convertit en NaN dès le chargement.\n")
 #guidelines relatives aux manques et leur impact
     print("""
             Recommandations pratiques génériques (indépendant des colonnes analysées) :
@@ -110,4 +163,8 @@ def rapport_data_complet(df, colonnes=None, total_lignes=None):
 # Exemple d'appel
 # ────────────────────────────────────────────────
 # Appel des colonnes identifiées au debut du projet
-rapport_data_complet(df, colonnes=cols_debut)
\ No newline at end of file
+# rapport_data_complet(df, colonnes=cols_debut, afficher=True)
+#
+# Même rapport directement depuis le fichier, sans le charger en entier
+# rapport_data_complet_csv("Speed+Dating+Data.csv", colonnes=cols_debut,
+#                          encoding="cp1252", afficher=True)
\ No newline at end of file
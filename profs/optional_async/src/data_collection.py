@@ -12,7 +12,9 @@ import logging
 import json
 import time
 import random
-from typing import Optional, Sequence
+from itertools import islice
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Optional, Sequence
 from uuid import uuid4
 
 import requests
@@ -20,6 +22,7 @@ from requests.exceptions import RequestException
 from tornado.httpclient import AsyncHTTPClient
 
 from config import config
+from storage import NdjsonSink, ParquetSink
 import youtube_api
 
 logger = logging.getLogger(__name__)
@@ -32,6 +35,16 @@ def get_batch(video_ids: Sequence, batch_size: int = 50) -> Sequence:
         yield video_ids[i:i + batch_size]
 
 
+def iter_batches(video_ids: Iterable, batch_size: int = 50):
+    """Yield batches from any iterable (list, generator, file...) lazily."""
+    it = iter(video_ids)
+    while True:
+        batch = list(islice(it, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
 async def fetch_batch(ids: Sequence, http_client: AsyncHTTPClient, 
                       dry_run: bool) -> Optional[dict]:
     """Make a single API call and return the result.
@@ -63,8 +76,83 @@ async def fetch_batch(ids: Sequence, http_client: AsyncHTTPClient,
     return data
 
 
-async def fetch_all(ids: Sequence, dry_run: bool = True) -> list:
-    """Fetch data asynchronously and save aggregated results in a file."""
+async def iter_fetch_all(ids: Iterable, dry_run: bool = True, max_in_flight: int = 10,
+                         batch_size: int = 50, connect_timeout: float = 20,
+                         request_timeout: float = 60) -> AsyncIterator[Optional[dict]]:
+    """Fetch data with a fixed pool of workers and yield results as they complete.
+
+    A producer feeds batches of IDs into a bounded `asyncio.Queue` and
+    `max_in_flight` workers pull from it, so at most `max_in_flight` requests
+    (and sockets) are open at any time. The results queue is bounded too: a
+    slow consumer pauses the workers. Memory stays constant whatever the
+    number of IDs, which may come from a generator.
+    """
+    client = AsyncHTTPClient(force_instance=True, max_clients=max_in_flight,
+                             defaults=dict(connect_timeout=connect_timeout,
+                                           request_timeout=request_timeout))
+    batches = asyncio.Queue(maxsize=max_in_flight)
+    results = asyncio.Queue(maxsize=max_in_flight)
+    worker_done = object()
+
+    async def producer():
+        try:
+            for batch_ids in iter_batches(ids, batch_size):
+                await batches.put(batch_ids)
+        finally:
+            # One stop signal per worker, even if `ids` raised
+            for _ in range(max_in_flight):
+                await batches.put(None)
+
+    async def worker():
+        while True:
+            batch_ids = await batches.get()
+            if batch_ids is None:
+                break
+            try:
+                data = await fetch_batch(batch_ids, client, dry_run)
+            except Exception as err:
+                logger.error(f'Error when fetching info for {batch_ids[0]}...'
+                             f'{batch_ids[-1]}: {err}')
+                data = None
+            await results.put(data)
+        await results.put(worker_done)
+
+    producer_task = asyncio.create_task(producer())
+    tasks = [producer_task]
+    tasks += [asyncio.create_task(worker()) for _ in range(max_in_flight)]
+    running = max_in_flight
+    try:
+        while running:
+            data = await results.get()
+            if data is worker_done:
+                running -= 1
+                continue
+            yield data
+        # Re-raise an error from the `ids` iterable instead of ending silently
+        await producer_task
+    finally:
+        for task in tasks:
+            task.cancel()
+        client.close()
+
+
+async def fetch_all(ids: Sequence, dry_run: bool = True,
+                    max_in_flight: Optional[int] = None) -> list:
+    """Fetch data asynchronously and save aggregated results in a file.
+
+    By default one task is created per batch up front. With `max_in_flight`,
+    a fixed pool of workers is used instead (see `iter_fetch_all`) and the
+    results come back in completion order.
+    """
+    if max_in_flight:
+        start = time.time()
+        logger.info(f'Requesting data for {len(ids)} videos with '
+                    f'{max_in_flight} workers. Please wait...')
+        all_data = [data async for data in iter_fetch_all(ids, dry_run, max_in_flight)]
+        duration = time.time() - start
+        logger.info(f'Done! Fetched data from {len(ids)} videos in {duration:.2f} sec')
+        return all_data
+
     start = time.time()
     client = AsyncHTTPClient()
     logger.info(f'Requesting data for {len(ids)} videos. Please wait...')
@@ -83,28 +171,59 @@ async def fetch_all(ids: Sequence, dry_run: bool = True) -> list:
 
     return all_data
 
-async def fetch_all_and_store(ids: Sequence, dry_run: bool = True) -> list:
-    """Fetch data asynchronously and save aggregated results in a file."""
+async def fetch_all_and_store(ids: Iterable, dry_run: bool = True,
+                              output_dir: Optional[Path] = None, fmt: str = 'ndjson',
+                              compression: Optional[str] = None,
+                              rotate_bytes: int = 256 * 1024 ** 2,
+                              max_in_flight: int = 10, connect_timeout: float = 20,
+                              request_timeout: float = 60) -> dict:
+    """Fetch data asynchronously and stream each batch's items to disk.
+
+    Items are handed to an `NdjsonSink` or `ParquetSink` (`fmt`) as soon as
+    their batch completes, so only a few batches are ever held in memory.
+    Each write is awaited before the next result is pulled: with the bounded
+    queues of `iter_fetch_all`, a slow disk pauses the fetchers.
+    `compression` can be None, 'gzip' or 'zstd' for NDJSON ('zstd' by
+    default for Parquet). `connect_timeout` and `request_timeout` (seconds)
+    are passed to the HTTP client. Return a summary with the files written.
+    """
+    output_dir = Path(output_dir or config.data_dir / 'videos')
+    if fmt == 'ndjson':
+        sink = NdjsonSink(output_dir, compression=compression, rotate_bytes=rotate_bytes)
+    elif fmt == 'parquet':
+        sink = ParquetSink(output_dir, compression=compression or 'zstd',
+                           rotate_bytes=rotate_bytes)
+    else:
+        raise ValueError(f'Unknown format "{fmt}", expected "ndjson" or "parquet".')
+
     start = time.time()
-    client = AsyncHTTPClient(connect_timeout =0,
-                             request_timeout =0)
-    logger.info(f'Requesting data for {len(ids)} videos. Please wait...')
-    tasks = [
-        asyncio.create_task(fetch_batch(batch_ids, client, dry_run))
-        for batch_ids in get_batch(ids)
-    ]
-    all_data = await asyncio.gather(*tasks)
-    
+    logger.info(f'Requesting data with {max_in_flight} workers, '
+                f'storing to {output_dir}. Please wait...')
+    batches = failed = 0
+    loop = asyncio.get_running_loop()
+    try:
+        async for data in iter_fetch_all(ids, dry_run, max_in_flight,
+                                         connect_timeout=connect_timeout,
+                                         request_timeout=request_timeout):
+            batches += 1
+            if data is None:
+                failed += 1
+                continue
+            await sink.write_async(data.get('items', []))
+    finally:
+        await loop.run_in_executor(None, sink.close)
+
     duration = time.time() - start
-    log_msg = f'Done! Fetched data from {len(ids)} videos in {duration:.2f} sec'
+    log_msg = (f'Done! Stored {sink.items_written} videos from {batches} batches '
+               f'({failed} without data) in {len(sink.files)} file(s) '
+               f'in {duration:.2f} sec')
     if dry_run:
         logger.debug(f'[DRY RUN] {log_msg}')
     else:
         logger.info(log_msg)
-    
-
 
-    return all_data
+    return {'files': sink.files, 'items': sink.items_written,
+            'batches': batches, 'failed': failed}
 
 
 ##############################################################################
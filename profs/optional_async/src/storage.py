@@ -0,0 +1,169 @@
+"""
+storage.py
+
+Streaming sinks used to store API results batch by batch, without keeping
+the whole response set in memory.
+"""
+import asyncio
+import gzip
+import json
+import logging
+from pathlib import Path
+from typing import Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class NdjsonSink:
+    """Append items as newline-delimited JSON, with buffering and rotation.
+
+    Lines are buffered in memory and flushed once `buffer_bytes` is reached.
+    A new file (`prefix-00001.ndjson[.zst|.gz]`) is started before a line
+    would push the current one past `rotate_bytes` on disk. Compressed sizes
+    are only known once the compressor emits data, so compressed files may
+    overshoot by its internal buffer. `compression` can be None, 'gzip' or
+    'zstd' (requires the `zstandard` package).
+
+    Disk writes run in a thread via `write_async`: awaiting it before pulling
+    the next result makes a slow disk slow the fetchers down (backpressure).
+    """
+
+    def __init__(self, output_dir: Path, prefix: str = 'videos',
+                 compression: Optional[str] = None,
+                 rotate_bytes: int = 256 * 1024 ** 2,
+                 buffer_bytes: int = 1024 ** 2):
+        if compression not in (None, 'gzip', 'zstd'):
+            raise ValueError(f'Unknown compression "{compression}".')
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.compression = compression
+        self.rotate_bytes = rotate_bytes
+        self.buffer_bytes = buffer_bytes
+        self.files = []
+        self.items_written = 0
+        self._buffer = []
+        self._buffered = 0
+        self._raw = None
+        self._stream = None
+
+    def _suffix(self) -> str:
+        return {None: '.ndjson', 'gzip': '.ndjson.gz',
+                'zstd': '.ndjson.zst'}[self.compression]
+
+    def _open_next(self) -> None:
+        self._close_file()
+        path = self.output_dir / f'{self.prefix}-{len(self.files) + 1:05d}{self._suffix()}'
+        self._raw = open(path, 'wb')
+        if self.compression == 'gzip':
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode='wb')
+        elif self.compression == 'zstd':
+            import zstandard
+            self._stream = zstandard.ZstdCompressor().stream_writer(self._raw)
+        else:
+            self._stream = self._raw
+        self.files.append(path)
+        logger.debug(f'Writing to {path}')
+
+    def _close_file(self) -> None:
+        if self._stream is not None:
+            self._stream.close()        # also closes the raw file
+            self._stream = self._raw = None
+
+    def write(self, items: Sequence[dict]) -> None:
+        """Buffer items and flush to disk when the buffer is full."""
+        for item in items:
+            line = json.dumps(item, ensure_ascii=False).encode() + b'\n'
+            self._buffer.append(line)
+            self._buffered += len(line)
+        self.items_written += len(items)
+        if self._buffered >= self.buffer_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        if self._stream is None:
+            self._open_next()
+        if self.compression is None:
+            # Exact size: split the buffer where the limit is reached
+            segment, size = [], self._raw.tell()
+            for line in self._buffer:
+                if size and size + len(line) > self.rotate_bytes:
+                    self._stream.write(b''.join(segment))
+                    self._open_next()
+                    segment, size = [], 0
+                segment.append(line)
+                size += len(line)
+            self._stream.write(b''.join(segment))
+        else:
+            for line in self._buffer:
+                if self._raw.tell() >= self.rotate_bytes:
+                    self._open_next()
+                self._stream.write(line)
+        self._buffer, self._buffered = [], 0
+
+    async def write_async(self, items: Sequence[dict]) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.write, items)
+
+    def close(self) -> None:
+        self.flush()
+        self._close_file()
+
+
+class ParquetSink:
+    """Append items to Parquet files, one row group per flushed buffer.
+
+    YouTube items are deeply nested and their fields vary between videos, so
+    each row keeps the video `id` plus the full item as a JSON string
+    (`item`), which keeps a stable schema across batches. A new file is
+    started once the current one grows past `rotate_bytes`. Requires `pyarrow`.
+    """
+
+    def __init__(self, output_dir: Path, prefix: str = 'videos',
+                 compression: Optional[str] = 'zstd',
+                 rotate_bytes: int = 256 * 1024 ** 2, buffer_rows: int = 10_000):
+        import pyarrow as pa
+        self._pa = pa
+        self.schema = pa.schema([('id', pa.string()), ('item', pa.string())])
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.compression = compression or 'none'
+        self.rotate_bytes = rotate_bytes
+        self.buffer_rows = buffer_rows
+        self.files = []
+        self.items_written = 0
+        self._ids, self._items = [], []
+        self._writer = None
+
+    def write(self, items: Sequence[dict]) -> None:
+        for item in items:
+            self._ids.append(item.get('id'))
+            self._items.append(json.dumps(item, ensure_ascii=False))
+        self.items_written += len(items)
+        if len(self._ids) >= self.buffer_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._ids:
+            return
+        import pyarrow.parquet as pq
+        if self._writer is None or self.files[-1].stat().st_size >= self.rotate_bytes:
+            if self._writer is not None:
+                self._writer.close()
+            path = self.output_dir / f'{self.prefix}-{len(self.files) + 1:05d}.parquet'
+            self._writer = pq.ParquetWriter(path, self.schema, compression=self.compression)
+            self.files.append(path)
+        table = self._pa.table({'id': self._ids, 'item': self._items}, schema=self.schema)
+        self._writer.write_table(table)
+        self._ids, self._items = [], []
+
+    async def write_async(self, items: Sequence[dict]) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.write, items)
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None